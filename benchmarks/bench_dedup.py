@@ -0,0 +1,85 @@
+"""Benchmark near-duplicate news clustering on a synthetic syndicated corpus.
+
+Run from the repo root:
+    python -m benchmarks.bench_dedup
+"""
+from __future__ import annotations
+import time
+import numpy as np
+from src.dedup import cluster_near_duplicates
+
+PUBLISHERS = ["Reuters", "Bloomberg", "FXStreet", "MarketWatch", "Yahoo Finance", "CNBC", "Investing.com", "PAP"]
+
+def synthetic_corpus(n_items: int, seed: int = 0) -> tuple[list[str], list[str], np.ndarray]:
+    """Stories of 8-14 random words, each syndicated 1-8 times with small edits.
+
+    Every copy also gets a 20-40 word summary, the size of a typical RSS
+    snippet. Returns (titles, summaries, true_story_id).
+    """
+    rng = np.random.default_rng(seed)
+    vocab = [f"w{i}" for i in range(5000)]
+    titles: list[str] = []
+    summaries: list[str] = []
+    story: list[int] = []
+    sid = 0
+    while len(titles) < n_items:
+        words = list(rng.choice(vocab, size=rng.integers(8, 15)))
+        for _ in range(rng.integers(1, 9)):
+            w = list(words)
+            if rng.random() < 0.3:  # light edit: swap one word
+                w[rng.integers(len(w))] = str(rng.choice(vocab))
+            t = " ".join(w)
+            if rng.random() < 0.3:
+                t = t.title()
+            titles.append(f"{t} - {rng.choice(PUBLISHERS)}")
+            summaries.append(" ".join(rng.choice(vocab, size=rng.integers(20, 41))))
+            story.append(sid)
+        sid += 1
+    return titles[:n_items], summaries[:n_items], np.asarray(story[:n_items])
+
+def _pair_scores(labels: np.ndarray, truth: np.ndarray) -> tuple[float, float]:
+    """Pairwise precision / recall of predicted clusters vs true stories."""
+    def pairs(*keys):
+        _, counts = np.unique(np.stack(keys, axis=1), axis=0, return_counts=True)
+        return float((counts * (counts - 1) // 2).sum())
+    both = pairs(labels, truth)
+    pred = pairs(labels)
+    true = pairs(truth)
+    return both / pred if pred else 1.0, both / true if true else 1.0
+
+def main() -> None:
+    print(f"{'items':>8} {'clusters':>9} {'stories':>8} {'secs':>7} {'us/item':>8} {'prec':>6} {'recall':>6}")
+    for n in (5_000, 10_000, 20_000, 40_000, 80_000):
+        titles, _, truth = synthetic_corpus(n)
+        t0 = time.perf_counter()
+        labels = cluster_near_duplicates(titles)
+        secs = time.perf_counter() - t0
+        prec, rec = _pair_scores(labels, truth)
+        print(f"{n:>8} {len(np.unique(labels)):>9} {len(np.unique(truth)):>8} {secs:>7.2f} {secs / n * 1e6:>8.1f} {prec:>6.3f} {rec:>6.3f}")
+
+    try:
+        from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+    except ImportError:
+        return
+    # score the same text news.fetch_feeds does: title plus summary
+    titles, summaries, _ = synthetic_corpus(20_000)
+    texts = [f"{t}. {s}" for t, s in zip(titles, summaries)]
+    analyzer = SentimentIntensityAnalyzer()
+    t0 = time.perf_counter()
+    for t in texts:
+        analyzer.polarity_scores(t)
+    t_all = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    labels = cluster_near_duplicates(titles)
+    t_cluster = time.perf_counter() - t0
+    reps = np.flatnonzero(labels == np.arange(len(titles)))
+    for i in reps:
+        analyzer.polarity_scores(texts[i])
+    t_dedup = time.perf_counter() - t0
+    print(
+        f"\nscoring 20k items ({len(reps)} reps): all={t_all:.2f}s"
+        f"  cluster={t_cluster:.2f}s  cluster+score reps={t_dedup:.2f}s  net={t_all / t_dedup:.2f}x"
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Compare the dict-of-DataFrames features with the float32 FeatureStore.
+
+Measures feature memory and the time to assemble IsolationForest flags
+(with the model predictions precomputed, so only assembly is timed), then
+the end-to-end detector time for both inputs.
+
+Run from the repo root:
+    python -m benchmarks.bench_feature_store
+"""
+from __future__ import annotations
+import time
+import numpy as np
+import pandas as pd
+from src import anomaly, features as feat
+from .common import random_walk_rates
+
+def dict_bytes(features: dict[str, pd.DataFrame]) -> int:
+    return int(sum(df.memory_usage(index=True, deep=True).sum() for df in features.values()))
+
+def assemble_loc(features: dict[str, pd.DataFrame], preds: dict[str, np.ndarray]) -> pd.DataFrame:
+    """Flag assembly as previously done: union index, then `.loc` per column."""
+    all_idx = None
+    for df in features.values():
+        all_idx = df.index if all_idx is None else all_idx.union(df.index)
+    flags = pd.DataFrame(False, index=all_idx, columns=list(features.keys()))
+    for cur, df in features.items():
+        flags.loc[df.index, cur] = pd.Series(preds[cur], index=df.index)
+    return flags.sort_index()
+
+def assemble_matrix(store, preds: dict[str, np.ndarray]) -> pd.DataFrame:
+    """Flag assembly with the store: one boolean matrix, one DataFrame."""
+    rows = store.valid.any(axis=0)
+    flags = np.zeros((len(store.index), len(store)), dtype=bool)
+    for j, view in enumerate(store.views()):
+        flags[view.rows, j] = preds[view.currency]
+    return pd.DataFrame(flags[rows], index=store.index[rows], columns=store.currencies)
+
+def _best(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def main() -> None:
+    rates = random_walk_rates(5000, [f"C{i:02d}" for i in range(30)])
+    t_dict = _best(lambda: feat.build_currency_features(rates, None), 3)
+    t_store = _best(lambda: feat.build_feature_store(rates, None), 3)
+    fdict = feat.build_currency_features(rates, None)
+    store = feat.build_feature_store(rates, None)
+    print(f"rates: {rates.shape[0]} days x {rates.shape[1]} currencies")
+    print(f"build:  dict {t_dict * 1e3:8.1f} ms   store {t_store * 1e3:8.1f} ms")
+    print(f"memory: dict {dict_bytes(fdict) / 1e6:8.2f} MB   store {store.nbytes / 1e6:8.2f} MB")
+
+    rng = np.random.default_rng(1)
+    preds = {cur: rng.random(len(df)) < 0.01 for cur, df in fdict.items()}
+    a = assemble_loc(fdict, preds)
+    b = assemble_matrix(store, preds)
+    assert a.equals(b)
+    print(f"flag assembly: .loc {_best(lambda: assemble_loc(fdict, preds)) * 1e3:8.2f} ms   "
+          f"matrix {_best(lambda: assemble_matrix(store, preds)) * 1e3:8.2f} ms")
+
+    t0 = time.perf_counter()
+    f1 = anomaly.isolation_forest_per_currency(fdict)
+    t1 = time.perf_counter()
+    f2 = anomaly.isolation_forest_per_currency(store)
+    t2 = time.perf_counter()
+    print(f"IsolationForest end-to-end: dict {t1 - t0:6.2f} s   store {t2 - t1:6.2f} s   identical={f1.equals(f2)}")
+
+if __name__ == "__main__":
+    main()
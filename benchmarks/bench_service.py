@@ -0,0 +1,91 @@
+"""Load test: many simulated dashboard sessions, local compute vs shared service.
+
+Each session does what one dashboard render does: rates, KPIs, z-score flags
+and IsolationForest flags. "local" mirrors the current app (rates shared via
+the process cache, detectors computed per session); "service" sends every
+call through `ComputeClient` to one `src.service` instance.
+
+Run from the repo root:
+    python -m benchmarks.bench_service [--sessions 32] [--param-sets 2]
+"""
+from __future__ import annotations
+import argparse
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from src import anomaly, data_sources, features as feat, transform
+from src.config import settings
+from src.service import ComputeClient, ComputeService, serve
+from .common import random_walk_rates
+
+CURRENCIES = ["USD", "GBP", "JPY", "CHF", "PLN", "SEK"]
+
+def write_snapshot(path: Path, n_days: int = 1500) -> None:
+    random_walk_rates(n_days, CURRENCIES, start="2019-01-01").assign(EUR=1.0).to_parquet(path)
+
+def session_params(i: int, param_sets: int) -> dict:
+    return dict(contamination=[0.01, 0.02, 0.03, 0.05][i % param_sets], z_window=30, z_thresh=2.5, vol_window=30)
+
+def run_local(n_sessions: int, param_sets: int, workers: int) -> float:
+    rates = data_sources.get_rates("EUR", 1000, offline=True)[CURRENCIES]  # st.cache_data equivalent
+
+    def session(i: int) -> None:
+        p = session_params(i, param_sets)
+        transform.compute_kpis(rates)
+        anomaly.rolling_zscore_anomalies(rates, window=p["z_window"], z_thresh=p["z_thresh"])
+        store = feat.build_feature_store(rates, None, vol_window=p["vol_window"])
+        anomaly.isolation_forest_per_currency(store, contamination=p["contamination"])
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(workers) as pool:
+        list(pool.map(session, range(n_sessions)))
+    return time.perf_counter() - t0
+
+def run_service(url: str, n_sessions: int, param_sets: int, workers: int) -> float:
+    client = ComputeClient(url)
+    args = dict(base="EUR", days=1000, offline=True, targets=CURRENCIES)
+
+    def session(i: int) -> None:
+        p = session_params(i, param_sets)
+        client.rates(**args)
+        client.kpis(**args)
+        client.zscore(**args, window=p["z_window"], thresh=p["z_thresh"])
+        client.iforest(**args, vol_window=p["vol_window"], contamination=p["contamination"])
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(workers) as pool:
+        list(pool.map(session, range(n_sessions)))
+    return time.perf_counter() - t0
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sessions", type=int, default=32)
+    ap.add_argument("--param-sets", type=int, default=2, help="distinct detector settings across sessions (1-4)")
+    ap.add_argument("--workers", type=int, default=16, help="concurrent sessions")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        snap = Path(tmp) / "snapshot.parquet"
+        write_snapshot(snap)
+        settings.snapshot_path = str(snap)
+
+        t_local = run_local(args.sessions, args.param_sets, args.workers)
+
+        service = ComputeService(archive_path=None)
+        server = serve(port=0, service=service)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            t_service = run_service(f"http://127.0.0.1:{server.server_port}", args.sessions, args.param_sets, args.workers)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    print(f"{args.sessions} sessions, {args.workers} concurrent, {args.param_sets} parameter set(s)")
+    print(f"local:   {t_local:7.2f} s  {args.sessions / t_local:7.2f} sessions/s")
+    print(f"service: {t_service:7.2f} s  {args.sessions / t_service:7.2f} sessions/s  ({t_local / t_service:.1f}x)")
+    print(f"service cache: {service.cache.stats}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Tick ingestion throughput of `TickEngine` on one core.
+
+Writes a synthetic tick file (random walks for 10 currencies), then measures
+ingest-only throughput and file replay + parse + ingest throughput.
+
+Run from the repo root:
+    python -m benchmarks.bench_streaming [--ticks 1000000]
+"""
+from __future__ import annotations
+import argparse
+import tempfile
+import time
+from pathlib import Path
+import numpy as np
+from src.streaming import FileReplaySource, Tick, TickEngine
+
+CURRENCIES = ["USD", "GBP", "JPY", "CHF", "CNY", "PLN", "SEK", "NOK", "CAD", "AUD"]
+
+def synthetic_ticks(n: int, seed: int = 0) -> list[Tick]:
+    rng = np.random.default_rng(seed)
+    cur = rng.integers(0, len(CURRENCIES), n)
+    steps = rng.normal(0, 1e-4, n)
+    level = np.ones(len(CURRENCIES))
+    ts = 1.7e9 + np.cumsum(rng.exponential(0.001, n))
+    out = []
+    for t, c, s in zip(ts.tolist(), cur.tolist(), steps.tolist()):
+        level[c] *= 1.0 + s
+        out.append(Tick(t, CURRENCIES[c], float(level[c])))
+    return out
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--ticks", type=int, default=1_000_000)
+    ap.add_argument("--capacity", type=int, default=10_000)
+    args = ap.parse_args()
+
+    ticks = synthetic_ticks(args.ticks)
+
+    engine = TickEngine(capacity=args.capacity)
+    t0 = time.perf_counter()
+    engine.ingest_many(ticks)
+    secs = time.perf_counter() - t0
+    print(f"ingest only:          {len(ticks) / secs:>10,.0f} ticks/s  ({secs:.2f} s)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "ticks.csv"
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("ts,currency,price\n")
+            f.writelines(f"{t.ts:.6f},{t.currency},{t.price:.8f}\n" for t in ticks)
+        engine = TickEngine(capacity=args.capacity)
+        t0 = time.perf_counter()
+        engine.ingest_many(FileReplaySource(str(path), speed=0))
+        secs = time.perf_counter() - t0
+        print(f"file replay + ingest: {engine.n_ticks / secs:>10,.0f} ticks/s  ({secs:.2f} s)")
+
+    buffered = sum(len(engine.history(c)) for c in engine.currencies())
+    print(f"buffered rows: {buffered:,} (capacity {args.capacity:,} x {len(engine.currencies())} currencies)")
+    print(engine.snapshot()[["price", "vol", "z", "flag", "n_ticks", "n_flags"]].to_string())
+
+if __name__ == "__main__":
+    main()
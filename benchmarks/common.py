@@ -0,0 +1,19 @@
+"""Synthetic inputs shared by the benchmarks and tests."""
+from __future__ import annotations
+import numpy as np
+import pandas as pd
+
+def random_walk_rates(
+    n_days: int,
+    currencies: list[str],
+    start: str = "2005-01-03",
+    seed: int = 0,
+    sigma: float = 0.005,
+) -> pd.DataFrame:
+    """Daily rates as geometric random walks on business days."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        np.exp(np.cumsum(rng.normal(0, sigma, (n_days, len(currencies))), axis=0)),
+        index=pd.bdate_range(start, periods=n_days),
+        columns=list(currencies),
+    )
@@ -2,12 +2,15 @@
 # See `LICENSE` for full terms.
 import streamlit as st
 import pandas as pd
+import requests
 from src.config import settings
-import plotly.graph_objects as go
-import numpy as np
 from datetime import datetime
+from pathlib import Path
 from src import anomaly, data_sources, transform, viz
 from src.currency_calculator import convert_currency
+from src.news_archive import NewsArchive
+from src.service import ComputeClient
+from src.streaming import TickEngine, open_tick_source
 st.set_page_config(page_title="Currency Exchange Dashboard", page_icon="💱", layout="wide", initial_sidebar_state="expanded")
 
 st.sidebar.title("Controls")
@@ -19,6 +22,8 @@ targets = st.sidebar.multiselect(
 )
 n_days = st.sidebar.slider("Lookback (days)", min_value=30, max_value=365*3, value=365)
 offline = st.sidebar.checkbox("Offline mode (use snapshot)", value=False)
+live_source = st.sidebar.text_input("Live tick source (file or tcp://host:port)", settings.tick_source).strip()
+live_speed = st.sidebar.number_input("Tick replay speed (x, 0 = max)", min_value=0.0, value=settings.tick_replay_speed, step=1.0)
 
 st.markdown(
     """
@@ -47,26 +52,73 @@ st.markdown(
 )
 st.markdown("---")
 
+# Optional shared compute service (see src/service.py); computes locally when unset
+compute = ComputeClient(settings.compute_service_url) if settings.compute_service_url else None
+
+def via_service(remote, local):
+    """Run `remote()` on the compute service, or `local()` if it is unset or unreachable."""
+    global compute
+    if compute is not None:
+        try:
+            return remote()
+        except requests.RequestException as e:
+            st.warning(f"Compute service unavailable ({type(e).__name__}); computing locally.")
+            compute = None  # don't retry for the rest of this run
+    return local()
+
+@st.cache_data(show_spinner=False, ttl=60)
+def service_news_archive(service_url: str) -> str | None:
+    """Resolved path of the news archive the compute service reads (None if it has none)."""
+    return ComputeClient(service_url).health().get("news_archive")
+
 @st.cache_data(show_spinner=False, ttl=settings.cache_ttl_min*60)
-def load_rates(base: str, targets: list[str], days: int, offline_mode: bool) -> pd.DataFrame:
+def load_rates(base: str, targets: list[str], days: int, offline_mode: bool, service_url: str = "") -> pd.DataFrame:
+    if service_url:
+        try:
+            return ComputeClient(service_url).rates(base, days, offline=offline_mode, targets=targets)
+        except requests.RequestException:
+            pass  # service down: load locally below
     df = data_sources.get_rates(base, days, offline=offline_mode)
     if targets:
         keep = [c for c in targets if c in df.columns]
         df = df[keep]
     return df
 
+@st.cache_resource(show_spinner=False)
+def get_news_archive(path: str) -> NewsArchive:
+    return NewsArchive(path)
+
+def stop_tick_engine() -> None:
+    engine = st.session_state.pop("tick_engine", None)
+    st.session_state.pop("tick_engine_key", None)
+    if engine is not None:
+        engine.stop()
+
+def get_tick_engine(source: str, speed: float, restart: bool = False) -> TickEngine:
+    """This session's tick engine; the previous one is stopped when the source or speed changes."""
+    key = (source, speed)
+    if restart or st.session_state.get("tick_engine_key") != key:
+        stop_tick_engine()
+    engine = st.session_state.get("tick_engine")
+    if engine is None:
+        engine = TickEngine(capacity=settings.tick_buffer_size, window=settings.tick_window, z_thresh=settings.tick_z_thresh)
+        engine.start(open_tick_source(source, speed=speed))
+        st.session_state["tick_engine"], st.session_state["tick_engine_key"] = engine, key
+    return engine
+
 with st.spinner("Loading rates..."):
-    rates = load_rates(base_currency, targets, n_days, offline)
+    rates = load_rates(base_currency, targets, n_days, offline, settings.compute_service_url)
 
 if rates.empty:
     st.warning("No data returned. Check base currency or offline snapshot.")
     st.stop()
 
-metrics = transform.compute_kpis(rates)
+service_args = dict(base=base_currency, days=n_days, offline=offline, targets=targets)
+metrics = via_service(lambda: compute.kpis(**service_args), lambda: transform.compute_kpis(rates))
 viz.render_kpis(metrics, base_currency)
 
-tab_ts, tab_returns, tab_heat, tab_anom, tab_about = st.tabs(
-    ["Time Series","% Change","Heatmap","Anomalies","About"]
+tab_ts, tab_returns, tab_heat, tab_anom, tab_live, tab_about = st.tabs(
+    ["Time Series","% Change","Heatmap","Anomalies","Live","About"]
 )
 
 with tab_anom:
@@ -89,9 +141,13 @@ with tab_anom:
         contam = st.slider("IF contamination", 0.001, 0.1, 0.01, 0.001)
 
     # Baseline: z-score on returns
-    z_flags = anomaly.rolling_zscore_anomalies(rates, window=z_win, z_thresh=z_thr)
+    z_flags = via_service(
+        lambda: compute.zscore(**service_args, window=z_win, thresh=z_thr),
+        lambda: anomaly.rolling_zscore_anomalies(rates, window=z_win, z_thresh=z_thr),
+    )
 
-    # News sentiment fetch (RSS + Google News RSS)
+    # News sentiment fetch (RSS + Google News RSS), persisted in the local news archive
+    archive = get_news_archive(settings.news_archive_path)
     with st.expander("News sentiment (source feeds)", expanded=False):
         days_back = st.slider("News lookback (days)", 1, 30, 7, key="news_days")
         # Let user scope feeds to a specific currency (or ALL)
@@ -107,7 +163,6 @@ with tab_anom:
         )
         feed_list = [ln.strip() for ln in feeds_text.splitlines() if ln.strip()]
 
-        # Detect changed fetch params and clear cached sentiment when inputs change
         current_fetch_params = {
             "feed_currency": feed_currency,
             "feeds_text": feeds_text,
@@ -115,50 +170,42 @@ with tab_anom:
             "base_currency": base_currency,
         }
 
-        # Clear cached sentiment when the available rates (target currencies) change
-        current_rates = list(rates.columns)
-        last_rates = st.session_state.get("news_last_rates")
-        if last_rates is not None and last_rates != current_rates:
-            # Rates changed since last fetch; clear cached results and metadata
-            if "sent_daily" in st.session_state:
-                st.session_state.pop("sent_daily", None)
-            st.session_state.pop("news_last_fetch_params", None)
-            st.session_state.pop("news_last_fetch_ts", None)
-            st.info("Available currencies changed — previous sentiment results were cleared. Click 'Fetch sentiment' to fetch updated results.")
-
-        # If fetch params changed since the last fetch, clear cached results and metadata
-        if st.session_state.get("news_last_fetch_params") is not None and st.session_state.get("news_last_fetch_params") != current_fetch_params:
-            if "sent_daily" in st.session_state:
-                st.session_state.pop("sent_daily", None)
-            # clear stored metadata too (timestamp / params)
-            st.session_state.pop("news_last_fetch_params", None)
-            st.session_state.pop("news_last_fetch_ts", None)
-            st.info("News feed parameters changed — previous sentiment results were cleared. Click 'Fetch sentiment' to fetch updated results.")
-
         if st.button("Fetch sentiment"):
             with st.spinner("Fetching & scoring news..."):
                 filter_cur = None if feed_currency == "ALL" else feed_currency
-                df_news = newsmod.fetch_feeds(feed_list, days_back=days_back, filter_currency=filter_cur)
-                st.write(f"Fetched {len(df_news)} items (filter={filter_cur or 'ALL'})")
-                st.dataframe(df_news[["published","title","sentiment","currencies","link"]], use_container_width=True)
-                sent_daily = newsmod.aggregate_daily_sentiment(df_news)
-                st.session_state["sent_daily"] = sent_daily
+                # items already in the archive are skipped before scoring
+                df_news = newsmod.fetch_feeds(feed_list, days_back=days_back, filter_currency=filter_cur, archive=archive)
+                n_added = archive.append(df_news)
+                n_raw = int(df_news["cluster_size"].sum()) if not df_news.empty else 0
+                st.write(f"Fetched {n_raw} new items, {n_added} distinct stories added to the archive (filter={filter_cur or 'ALL'})")
+                st.dataframe(df_news[["published","title","sentiment","cluster_size","currencies","link"]], use_container_width=True)
                 st.session_state["news_last_fetch_params"] = current_fetch_params
                 st.session_state["news_last_fetch_ts"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                # record the rates snapshot used for this fetch so future changes can clear cache
-                st.session_state["news_last_rates"] = current_rates
-        sent_daily = st.session_state.get("sent_daily", pd.DataFrame())
 
         # Lightweight visual indicator of last fetched params & time
-        if "sent_daily" in st.session_state and st.session_state.get("news_last_fetch_params"):
+        if st.session_state.get("news_last_fetch_params"):
             last = st.session_state.get("news_last_fetch_ts")
             p = st.session_state.get("news_last_fetch_params", {})
             feeds_count = len(p.get("feeds_text", "").splitlines()) if p.get("feeds_text") else 0
             st.caption(f"Last fetched: {last} — Feed: {p.get('feed_currency','ALL')} • Days: {p.get('days_back')} • Feeds: {feeds_count}")
-
-    # Build per-currency feature tables: ret, vol, sent
-    feats = feat.build_currency_features(rates, sent_daily, vol_window=vol_win)
-    if_flags = anomaly.isolation_forest_per_currency(feats, contamination=contam)
+        st.caption(f"News archive: {len(archive)} stories ({settings.news_archive_path})")
+
+    # Build per-currency feature tables: ret, vol, sent (sentiment read from the archive for the full range)
+    feats = feat.build_feature_store(rates, None, vol_window=vol_win, archive=archive)
+    local_if = lambda: anomaly.isolation_forest_per_currency(feats, contamination=contam)
+    # the service's flags must come from the same sentiment as the features shown on hover
+    remote_archive = via_service(lambda: service_news_archive(settings.compute_service_url), lambda: None)
+    if compute is not None and remote_archive != str(Path(archive.path).resolve()):
+        st.warning(
+            f"Compute service reads news archive {remote_archive or '(none)'}, the dashboard reads "
+            f"{Path(archive.path).resolve()}; computing IsolationForest flags locally."
+        )
+        if_flags = local_if()
+    else:
+        if_flags = via_service(
+            lambda: compute.iforest(**service_args, vol_window=vol_win, contamination=contam),
+            local_if,
+        )
 
     st.markdown("**Latest anomaly snapshot (today):**")
     latest = pd.DataFrame({
@@ -170,117 +217,10 @@ with tab_anom:
     cur_pick = st.selectbox("Inspect currency", list(rates.columns), index=0, key="anom_cur")
     s = rates[cur_pick].dropna()
 
-    # -- compute z-score series (for hover/annotations) aligned to s.index
-    rets = s.pct_change()
-    mu = rets.rolling(z_win).mean()
-    sd = rets.rolling(z_win).std()
-    z_series = ((rets - mu) / sd).reindex(s.index)
-
     zf = z_flags[cur_pick].reindex(s.index, fill_value=False) if not z_flags.empty else pd.Series(False, index=s.index)
     iff = if_flags[cur_pick].reindex(s.index, fill_value=False) if not if_flags.empty else pd.Series(False, index=s.index)
 
-    from plotly.subplots import make_subplots
-
-    # Build a 2-row subplot: rates (row 1) and z-score bars (row 2) for clarity
-    fig = make_subplots(
-        rows=2,
-        cols=1,
-        shared_xaxes=True,
-        row_heights=[0.72, 0.28],
-        vertical_spacing=0.06,
-        subplot_titles=(f"{cur_pick}/{base_currency}", "Z-score (returns)")
-    )
-
-    # Row 1: rates line
-    fig.add_trace(
-        go.Scatter(
-            x=s.index,
-            y=s.values,
-            mode="lines",
-            name=f"{cur_pick}/{base_currency}",
-            line=dict(width=2, color="#0b3954"),
-            hovertemplate="Date: %{x}<br>Rate: %{y:.4f}<extra></extra>",
-        ),
-        row=1,
-        col=1,
-    )
-
-    # Row 1: IF markers with detailed hover
-    if iff.any():
-        feats_df = feats.get(cur_pick, pd.DataFrame()).reindex(s.index).fillna(0.0)
-        ret_vals = feats_df.get("ret", pd.Series(0.0, index=s.index)).values
-        vol_vals = feats_df.get("vol", pd.Series(0.0, index=s.index)).values
-        sent_vals = feats_df.get("sent", pd.Series(0.0, index=s.index)).values
-        custom_if = np.vstack([ret_vals[iff], vol_vals[iff], sent_vals[iff]]).T
-        fig.add_trace(
-            go.Scatter(
-                x=s.index[iff],
-                y=s.values[iff],
-                mode="markers",
-                name="IF (ret+vol+sent)",
-                marker=dict(size=10, symbol="circle-open", color="#FFA630"),
-                customdata=custom_if,
-                hovertemplate=(
-                    "Date: %{x}<br>Rate: %{y:.4f}<br>IF anomaly: True"
-                    "<br>Ret: %{customdata[0]:.2%}<br>Vol: %{customdata[1]:.2%}<br>Sent: %{customdata[2]:.2f}<extra></extra>"
-                ),
-            ),
-            row=1,
-            col=1,
-        )
-
-    # Row 2: z-score bars (color by sign)
-    z_vals = z_series.fillna(0.0)
-    colors = ["#E07A5F" if v > 0 else "#087E8B" for v in z_vals]
-    fig.add_trace(
-        go.Bar(
-            x=s.index,
-            y=z_vals,
-            marker_color=colors,
-            name="Z-score",
-            hovertemplate="Date: %{x}<br>Z-score: %{y:.2f}<extra></extra>",
-        ),
-        row=2,
-        col=1,
-    )
-
-    # Add threshold lines on z-score subplot
-    fig.add_hline(y=z_thr, line=dict(color="rgba(224,122,95,0.6)", dash="dash"), row=2, col=1)
-    fig.add_hline(y=-z_thr, line=dict(color="rgba(8,126,139,0.6)", dash="dash"), row=2, col=1)
-
-    # Annotate top N absolute z anomalies on z subplot for clarity
-    top_n = 3
-    top_z = z_vals[ zf ].abs().nlargest(top_n)
-    for idx, val in top_z.items():
-        z_val = z_series.loc[idx]
-        sign_color = "#E07A5F" if z_val > 0 else "#087E8B"
-        bg = "rgba(224,122,95,0.12)" if z_val > 0 else "rgba(8,126,139,0.12)"
-        fig.add_annotation(
-            x=idx,
-            y=z_val,
-            xref='x',
-            yref='y2',
-            text=f"Z={z_val:.2f}",
-            showarrow=True,
-            arrowhead=2,
-            ax=0,
-            ay=-20,
-            bgcolor=bg,
-            bordercolor=sign_color,
-            font=dict(color=sign_color),
-        )
-
-    fig.update_layout(
-        title=f"Anomalies for {cur_pick}/{base_currency}",
-        template="plotly_white",
-        hovermode="x unified",
-        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-        margin=dict(l=40, r=20, t=60, b=40)
-    )
-    fig.update_xaxes(showgrid=False)
-    fig.update_yaxes(showgrid=True, row=1, col=1)
-    fig.update_yaxes(title_text="Z-score", row=2, col=1)
-
+    fig = viz.plot_anomalies(s, zf, iff, feats.get(cur_pick), cur_pick, base_currency, z_window=z_win, z_thresh=z_thr)
     st.plotly_chart(fig, use_container_width=True)
 
     st.caption("IsolationForest is trained **per currency** on features: return, rolling vol, and daily sentiment (0 if missing).")
@@ -296,11 +236,38 @@ with tab_heat:
     returns = transform.pct_change(rates)
     st.plotly_chart(viz.plot_heatmap(returns, base_currency), use_container_width=True)
 
+with tab_live:
+    if not live_source:
+        stop_tick_engine()
+        st.info("Set a live tick source in the sidebar (tick file or tcp://host:port) to monitor intraday ticks.")
+    else:
+        restart = st.button("Restart live feed", help="Reconnect to the tick source and clear the buffers")
+        engine = get_tick_engine(live_source, live_speed, restart=restart)
+
+        # Poll the background tick engine every 2 seconds without rerunning the whole app
+        @st.fragment(run_every=2)
+        def live_panel():
+            if engine.error is not None:
+                st.error(f"Tick source stopped: {engine.error}")
+            snap = engine.snapshot()
+            if snap.empty:
+                st.caption("Waiting for ticks...")
+                return
+            state = "running" if engine.running else "stopped"
+            st.caption(f"{engine.n_ticks:,} ticks ingested ({state}) • window {engine.window} ticks • z threshold {engine.z_thresh}")
+            st.dataframe(snap, use_container_width=True)
+            live_cur = st.selectbox("Live currency", list(snap.index), key="live_cur")
+            st.plotly_chart(viz.plot_live_ticks(engine.history(live_cur), live_cur, base_currency), use_container_width=True)
+
+        live_panel()
+
 with tab_about:
     st.markdown("""
 ### About
 - **Config** via environment variables (see `.env.example`) using pydantic-settings.
-- **Caching**: Streamlit cache; optional offline snapshot fallback.
+- **Caching**: Streamlit cache; optional offline snapshot fallback; optional shared compute service (`COMPUTE_SERVICE_URL`, run `python -m src.service`).
+- **Live ticks**: replay intraday ticks from a file or socket (`TICK_SOURCE`); rolling returns, volatility and z-score flags update per tick.
+- **News archive**: fetched news is appended to a local SQLite archive (`NEWS_ARCHIVE_PATH`); sentiment features read the full history from it.
 - **Structure**: `src/` modules for data, transforms, viz; tests under `tests/`.
 - **Next**: add forecasting/backtesting in `src/analytics.py` and a Biotech Ops tab.
 """)
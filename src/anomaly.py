@@ -1,6 +1,7 @@
 from sklearn.ensemble import IsolationForest
 import pandas as pd
 import numpy as np
+from .feature_store import FeatureStore
 
 def isolation_forest_anomalies(rates: pd.DataFrame, contamination: float = 0.01) -> pd.DataFrame:
     """Boolean DF using IsolationForest on daily returns."""
@@ -31,26 +32,45 @@ def rolling_zscore_anomalies(rates: pd.DataFrame, window: int = 30, z_thresh: fl
     return flags.fillna(False)
 
 def isolation_forest_per_currency(
-    features: dict[str, pd.DataFrame],
+    features: dict[str, pd.DataFrame] | FeatureStore,
     contamination: float = 0.01,
 ) -> pd.DataFrame:
     """
     Train one IsolationForest per currency on columns ['ret','vol','sent'].
     Returns a boolean DataFrame flags indexed by date, columns=currency.
+
+    `features` is either the dict from `features.build_currency_features` or
+    a `FeatureStore`; the store feeds its float32 rows to the model without
+    copying. Flags are assembled in one boolean (date x currency) matrix.
     """
+    if isinstance(features, FeatureStore):
+        curs = features.currencies
+        rows = features.valid.any(axis=0)
+        flags = np.zeros((len(features.index), len(curs)), dtype=bool)
+        for j, view in enumerate(features.views()):
+            if len(view) < 30:
+                continue
+            flags[view.rows, j] = _fit_predict_iforest(view.X, contamination)
+        return pd.DataFrame(flags[rows], index=features.index[rows], columns=curs)
+
     # Union all dates to a common index
     all_idx = None
     for df in features.values():
         all_idx = df.index if all_idx is None else all_idx.union(df.index)
-    flags = pd.DataFrame(False, index=all_idx, columns=list(features.keys()))
-    for cur, df in features.items():
+    curs = list(features.keys())
+    if all_idx is None:
+        return pd.DataFrame(False, index=all_idx, columns=curs)
+    flags = np.zeros((len(all_idx), len(curs)), dtype=bool)
+    for j, (cur, df) in enumerate(features.items()):
         if df.shape[0] < 30:
             continue
         X = df[["ret","vol","sent"]].values
-        model = IsolationForest(
-            contamination=contamination, n_estimators=300, random_state=42, n_jobs=-1
-        )
-        preds = model.fit_predict(X)  # -1 anomalous
-        f = pd.Series(preds == -1, index=df.index)
-        flags.loc[df.index, cur] = f
-    return flags.sort_index()
\ No newline at end of file
+        flags[all_idx.get_indexer(df.index), j] = _fit_predict_iforest(X, contamination)
+    return pd.DataFrame(flags, index=all_idx, columns=curs).sort_index()
+
+def _fit_predict_iforest(X: np.ndarray, contamination: float) -> np.ndarray:
+    """Boolean anomaly mask from a per-currency IsolationForest."""
+    model = IsolationForest(
+        contamination=contamination, n_estimators=300, random_state=42, n_jobs=-1
+    )
+    return model.fit_predict(X) == -1  # -1 anomalous
@@ -5,6 +5,13 @@ class Settings(BaseSettings):
     cache_ttl_min: int = 60 # Default streamlit data cache in minutes
     data_source : str = "ECB" # whether the data should be downloaded live or restored from online snapshot
     snapshot_path: str = "data/snapshot.parquet" #Default path to store data
+    news_archive_path: str = "data/news.sqlite" # Local append-only news archive
+    compute_service_url: str = "" # e.g. http://127.0.0.1:8765 to share computations via src/service.py
+    tick_source: str = "" # live tick file path or tcp://host:port (see src/streaming.py)
+    tick_replay_speed: float = 1.0 # replay speed for tick sources (0 = as fast as possible)
+    tick_buffer_size: int = 10_000 # ticks kept per currency
+    tick_window: int = 30 # rolling window (ticks) for live returns/vol/z-score
+    tick_z_thresh: float = 2.5 # live z-score flag threshold
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,126 @@
+from __future__ import annotations
+import re
+from typing import Sequence
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+_SUFFIX_RE = re.compile(r"\s+[-|–—]\s+[^-|–—]{1,40}$")  # " - Reuters", " | FXStreet"
+_NON_WORD_RE = re.compile(r"[^\w]+")
+
+def normalize_title(text: str) -> str:
+    """Lowercase, drop a trailing ' - Publisher' suffix and collapse punctuation."""
+    t = _SUFFIX_RE.sub("", text or "").lower()
+    return _NON_WORD_RE.sub(" ", t).strip()
+
+def _chunk_shingles(texts: Sequence[str], k: int) -> tuple[np.ndarray, np.ndarray]:
+    """Byte k-grams (k <= 4) of all texts packed into uint64, plus per-text offsets.
+
+    k-grams never span two texts; texts shorter than k are space-padded so
+    each contributes at least one shingle. Repeated shingles are kept: they
+    do not change a minimum.
+    """
+    encoded = [t.encode("utf-8").ljust(k) for t in texts]
+    lengths = np.fromiter((len(e) for e in encoded), dtype=np.int64, count=len(encoded))
+    buf = np.frombuffer(b"".join(encoded), dtype=np.uint8).astype(np.uint64)
+    grams = buf[: buf.size - k + 1].copy()
+    for j in range(1, k):
+        grams = (grams << np.uint64(8)) | buf[j: buf.size - k + 1 + j]
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    n_grams = lengths - k + 1
+    # positions whose k-gram lies fully inside one text
+    valid = np.repeat(starts, n_grams) + (np.arange(n_grams.sum()) - np.repeat(np.cumsum(n_grams) - n_grams, n_grams))
+    offsets = np.concatenate(([0], np.cumsum(n_grams)[:-1]))
+    return grams[valid], offsets
+
+def minhash_signatures(
+    texts: Sequence[str],
+    num_perm: int = 64,
+    k: int = 4,
+    seed: int = 42,
+    chunk_size: int = 1000,
+) -> np.ndarray:
+    """MinHash signature matrix of shape (len(texts), num_perm), dtype uint32.
+
+    Shingles are byte k-grams (k <= 4). Each chunk of texts is hashed in one
+    vectorized pass and reduced per text with `np.minimum.reduceat`.
+    """
+    if not 1 <= k <= 4:
+        raise ValueError("k must be between 1 and 4")
+    # Multiply-shift hashing h(x) = (a*x + b) >> 32 with random 64-bit a, b.
+    # uint64 arithmetic wraps, which is exactly the mod 2**64 the scheme needs,
+    # and the shift is monotonic so it can be applied after the min-reduction.
+    rng = np.random.default_rng(seed)
+    a = (rng.integers(0, 2**63, size=num_perm, dtype=np.uint64) << np.uint64(1) | np.uint64(1))[:, None]
+    b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)[:, None]
+
+    sigs = np.empty((len(texts), num_perm), dtype=np.uint32)
+    for start in range(0, len(texts), chunk_size):
+        grams, offsets = _chunk_shingles(texts[start:start + chunk_size], k)
+        hashed = a * grams[None, :] + b
+        mins = np.minimum.reduceat(hashed, offsets, axis=1)
+        sigs[start:start + len(offsets)] = (mins >> np.uint64(32)).T
+    return sigs
+
+def cluster_near_duplicates(
+    texts: Sequence[str],
+    threshold: float = 0.6,
+    num_perm: int = 64,
+    bands: int = 16,
+    k: int = 4,
+    seed: int = 42,
+) -> np.ndarray:
+    """Group near-duplicate texts with MinHash + LSH banding.
+
+    Documents sharing any LSH band bucket become candidates; a candidate pair
+    is kept if its estimated Jaccard similarity (share of equal MinHash slots)
+    is >= `threshold`. Clusters are the connected components of kept pairs.
+
+    Texts that normalize to an empty string (missing or punctuation-only
+    titles) carry no evidence of duplication and stay singletons.
+
+    Returns an int array `labels` where `labels[i]` is the index of the first
+    document of i's cluster (its representative); `labels[i] == i` for reps.
+    """
+    if num_perm % bands:
+        raise ValueError("num_perm must be divisible by bands")
+    norm = [normalize_title(t) for t in texts]
+    labels = np.arange(len(norm))
+    keep = np.flatnonzero([bool(t) for t in norm])
+    if keep.size:
+        sub = _cluster_signatures(
+            minhash_signatures([norm[i] for i in keep], num_perm=num_perm, k=k, seed=seed),
+            threshold, bands,
+        )
+        labels[keep] = keep[sub]  # keep is increasing, so first-member order is preserved
+    return labels
+
+def _cluster_signatures(sigs: np.ndarray, threshold: float, bands: int) -> np.ndarray:
+    """LSH banding + connected components over a MinHash signature matrix."""
+    n, num_perm = sigs.shape
+
+    rows = num_perm // bands
+    src, dst = [], []
+    for band in range(bands):
+        block = np.ascontiguousarray(sigs[:, band * rows:(band + 1) * rows])
+        keys = block.view(np.dtype((np.void, block.dtype.itemsize * rows))).ravel()
+        _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        # pair every document with the first document of its bucket
+        heads = first[inverse.ravel()]
+        cand = np.flatnonzero(heads != np.arange(n))
+        if cand.size == 0:
+            continue
+        sim = (sigs[cand] == sigs[heads[cand]]).mean(axis=1)
+        keep = cand[sim >= threshold]
+        src.append(keep)
+        dst.append(heads[keep])
+
+    if not src:
+        return np.arange(n)
+    src_all = np.concatenate(src)
+    dst_all = np.concatenate(dst)
+    graph = coo_matrix((np.ones(src_all.size, dtype=np.int8), (src_all, dst_all)), shape=(n, n))
+    _, comp = connected_components(graph, directed=False)
+    rep = np.full(comp.max() + 1, n, dtype=np.int64)
+    np.minimum.at(rep, comp, np.arange(n))
+    return rep[comp]
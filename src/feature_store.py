@@ -0,0 +1,89 @@
+from __future__ import annotations
+import numpy as np
+import pandas as pd
+
+FEATURES = ("ret", "vol", "sent")
+
+class CurrencyFeatures:
+    """Zero-copy view of one currency's rows in a `FeatureStore`.
+
+    `X` is the (rows x features) float32 block of valid rows (ret and vol
+    present). When those rows are contiguous, which is the usual case after
+    the volatility warm-up, `X` is a slice of the store without any copy.
+    """
+    __slots__ = ("currency", "X", "rows")
+
+    def __init__(self, currency: str, values: np.ndarray, valid: np.ndarray):
+        self.currency = currency
+        pos = np.flatnonzero(valid)
+        if pos.size and pos[-1] - pos[0] + 1 == pos.size:
+            self.rows = slice(int(pos[0]), int(pos[-1]) + 1)
+            self.X = values[self.rows]
+        else:
+            self.rows = pos
+            self.X = values[pos]
+
+    def __len__(self) -> int:
+        return self.X.shape[0]
+
+class FeatureStore:
+    """Per-currency detector features in one contiguous float32 array.
+
+    `values` has shape (currency, date, feature) and shares a single date
+    `index`; `valid[c, t]` marks rows where the core features are present.
+    `get(cur)` returns the same DataFrame `build_currency_features` would, so
+    the store can be used wherever the old dict of frames was.
+    """
+    __slots__ = ("currencies", "index", "features", "values", "valid", "_pos")
+
+    def __init__(
+        self,
+        currencies: list[str],
+        index: pd.DatetimeIndex,
+        values: np.ndarray,
+        valid: np.ndarray,
+        features: tuple[str, ...] = FEATURES,
+    ):
+        if values.shape != (len(currencies), len(index), len(features)):
+            raise ValueError("values must have shape (currencies, dates, features)")
+        self.currencies = list(currencies)
+        self.index = index
+        self.features = tuple(features)
+        self.values = np.ascontiguousarray(values, dtype=np.float32)
+        self.valid = np.asarray(valid, dtype=bool)
+        self._pos = {c: i for i, c in enumerate(self.currencies)}
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the feature array, validity mask and shared index."""
+        return self.values.nbytes + self.valid.nbytes + self.index.nbytes
+
+    def __len__(self) -> int:
+        return len(self.currencies)
+
+    def __iter__(self):
+        return iter(self.currencies)
+
+    def __contains__(self, cur) -> bool:
+        return cur in self._pos
+
+    def keys(self) -> list[str]:
+        return list(self.currencies)
+
+    def view(self, cur: str) -> CurrencyFeatures:
+        i = self._pos[cur]
+        return CurrencyFeatures(cur, self.values[i], self.valid[i])
+
+    def views(self):
+        for cur in self.currencies:
+            yield self.view(cur)
+
+    def get(self, cur: str, default=None) -> pd.DataFrame | None:
+        """Feature frame of one currency (valid rows only), or `default`."""
+        if cur not in self._pos:
+            return default
+        v = self.view(cur)
+        return pd.DataFrame(v.X, index=self.index[v.rows], columns=list(self.features))
+
+    def to_dict(self) -> dict[str, pd.DataFrame]:
+        return {cur: self.get(cur) for cur in self.currencies}
@@ -1,39 +1,76 @@
 from __future__ import annotations
+import numpy as np
 import pandas as pd
+from .feature_store import FEATURES, FeatureStore
+from .news_archive import NewsArchive
 
 def rolling_volatility(returns: pd.DataFrame, window: int = 30) -> pd.DataFrame:
     """Rolling std of daily returns per currency."""
     return returns.rolling(window).std()
 
+def _sentiment_matrix(sentiment_daily: pd.DataFrame | None, index: pd.DatetimeIndex, currencies) -> pd.DataFrame:
+    """Daily mean sentiment aligned to `index` by calendar date; missing -> neutral 0.0."""
+    if sentiment_daily is None or sentiment_daily.empty:
+        return pd.DataFrame(0.0, index=index, columns=currencies)
+    dates = pd.to_datetime(sentiment_daily["date"])
+    wide = (
+        sentiment_daily.assign(date=dates)
+        .groupby(["date", "currency"])["mean_sentiment"].last()
+        .unstack("currency")
+    )
+    # align sentiment by calendar date (index may be tz-naive)
+    days = index.tz_localize(None).normalize() if index.tz is not None else index.normalize()
+    out = wide.reindex(index=days, columns=currencies).fillna(0.0)
+    out.index = index
+    return out.astype(float)
+
+def _feature_frames(rates, sentiment_daily, vol_window, archive):
+    """Wide (date x currency) frames of returns, rolling vol and sentiment."""
+    rets = rates.pct_change()
+    vol = rolling_volatility(rets, vol_window)
+
+    if sentiment_daily is None and archive is not None and not rates.empty:
+        sentiment_daily = archive.daily_sentiment(
+            start=rates.index.min(), end=rates.index.max(), currencies=list(rates.columns)
+        )
+    sent = _sentiment_matrix(sentiment_daily, rates.index, list(rates.columns))
+    return rets, vol, sent
+
 def build_currency_features(
     rates: pd.DataFrame,
     sentiment_daily: pd.DataFrame | None,
     vol_window: int = 30,
+    archive: NewsArchive | None = None,
 ) -> dict[str, pd.DataFrame]:
     """
     For each currency, build a per-day feature table with columns:
     ['ret', 'vol', 'sent'] aligned on dates.
     Returns a dict: currency -> DataFrame(features)
-    """
-    rets = rates.pct_change()
-    vol = rolling_volatility(rets, vol_window)
 
-    # Sentiment: (date, currency) -> mean_sentiment
-    sent_map: dict[tuple, float] = {}
-    if sentiment_daily is not None and not sentiment_daily.empty:
-        for _, r in sentiment_daily.iterrows():
-            sent_map[(r["date"], r["currency"])] = float(r["mean_sentiment"])
+    If `sentiment_daily` is None and an `archive` is given, daily sentiment
+    for the full date range of `rates` is read from the archive.
+    """
+    rets, vol, sent = _feature_frames(rates, sentiment_daily, vol_window, archive)
 
     features = {}
     for cur in rates.columns:
         df = pd.DataFrame(index=rates.index)
         df["ret"] = rets[cur]
         df["vol"] = vol[cur]
-        # align sentiment by calendar date (index may be tz-naive)
-        sents = []
-        for d in df.index:
-            key = (d.date(), cur)
-            sents.append(sent_map.get(key, 0.0))  # missing -> neutral 0.0
-        df["sent"] = sents
+        df["sent"] = sent[cur]
         features[cur] = df.dropna(subset=["ret","vol"])  # keep rows with core features
     return features
+
+def build_feature_store(
+    rates: pd.DataFrame,
+    sentiment_daily: pd.DataFrame | None,
+    vol_window: int = 30,
+    archive: NewsArchive | None = None,
+) -> FeatureStore:
+    """Same features as `build_currency_features`, packed into a float32 `FeatureStore`."""
+    rets, vol, sent = _feature_frames(rates, sentiment_daily, vol_window, archive)
+    values = np.empty((rates.shape[1], rates.shape[0], len(FEATURES)), dtype=np.float32)
+    for k, frame in enumerate((rets, vol, sent)):
+        values[:, :, k] = frame.to_numpy(dtype=np.float64).T
+    valid = ~(np.isnan(values[:, :, 0]) | np.isnan(values[:, :, 1]))  # keep rows with core features
+    return FeatureStore(list(rates.columns), rates.index, values, valid)
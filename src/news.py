@@ -1,9 +1,12 @@
 from __future__ import annotations
 import datetime as dt
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import feedparser
+import numpy as np
 import pandas as pd
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+from .dedup import cluster_near_duplicates
+from .news_archive import NewsArchive, link_hash
 
 
 
@@ -57,6 +60,8 @@ class NewsItem:
     link: str
     sentiment: float
     currencies: list[str]
+    cluster_size: int = 1
+    duplicate_links: list[str] = field(default_factory=list)
 
 def _infer_currencies(text:str) -> list[str]:
     t = text.lower()
@@ -69,16 +74,29 @@ def fetch_feeds(
     feeds: list[str] | None = None,
     days_back: int = 7,
     filter_currency: str | None = None,
+    dedup: bool = True,
+    dedup_threshold: float = 0.6,
+    archive: NewsArchive | None = None,
 ) -> pd.DataFrame:
     """Fetch RSS feeds and return scored items.
 
     If `filter_currency` is provided, only items that mention that currency
-    (based on `_infer_currencies`) will be returned.
+    (based on `_infer_currencies`) will be returned. The filter runs before
+    clustering, so copies that don't mention it neither represent nor count
+    towards a cluster.
+
+    With `dedup` (default) syndicated copies of the same story are clustered
+    by title (see `dedup.cluster_near_duplicates`) and only the first item of
+    each cluster is scored and returned; `cluster_size` records how many
+    copies it stands for and `duplicate_links` the links of the other copies.
+
+    If `archive` is given, items it already holds (by link hash) are skipped
+    before clustering and scoring, so only new items are returned.
     """
     if feeds is None:
         feeds = DEFAULT_FEEDS
     cutoff = pd.Timestamp.utcnow() - pd.Timedelta(days=days_back)
-    items: list[NewsItem] = []
+    raw: list[tuple[pd.Timestamp, str, str, str]] = []
     for url in feeds:
         parsed = feedparser.parse(url)
         for e in parsed.entries:
@@ -93,33 +111,71 @@ def fetch_feeds(
                 continue
             title = getattr(e, "title", "") or ""
             summary = getattr(e, "summary", "") or ""
-            text = f"{title}. {summary}"
-            sent = analyzer.polarity_scores(text)["compound"]  # the overall sentiment score between -1 and 1
             link = getattr(e, "link", "") or ""
-            curs = _infer_currencies(text)
-            # If a filter is requested, skip items that don't mention the currency.
-            if filter_currency and filter_currency not in curs:
-                continue
-            items.append(NewsItem(pub, title, summary, link, sent, curs))
+            raw.append((pub, title, summary, link))
+
+    # the same entry often comes back from several (overlapping) feeds;
+    # keep it once so it isn't counted as a syndicated copy of itself
+    hashes = [link_hash(r[3], r[1]) for r in raw]
+    known = archive.known_hashes(hashes) if archive is not None and raw else set()
+    seen: set[str] = set()
+    unique = []
+    for r, h in zip(raw, hashes):
+        if h not in known and h not in seen:
+            seen.add(h)
+            unique.append(r)
+    raw = unique
+
+    curs = [_infer_currencies(f"{r[1]}. {r[2]}") for r in raw]
+    if filter_currency:
+        # filter every copy, not just cluster representatives
+        keep = [i for i, c in enumerate(curs) if filter_currency in c]
+        raw, curs = [raw[i] for i in keep], [curs[i] for i in keep]
+
+    if dedup and raw:
+        labels = cluster_near_duplicates([r[1] for r in raw], threshold=dedup_threshold)
+    else:
+        labels = np.arange(len(raw))
+    sizes = np.bincount(labels, minlength=len(raw))
+    dup_links: dict[int, list[str]] = {}
+    for i in np.flatnonzero(labels != np.arange(len(raw))):
+        rep = int(labels[i])
+        if raw[i][3] and raw[i][3] != raw[rep][3]:
+            dup_links.setdefault(rep, []).append(raw[i][3])
+
+    items: list[NewsItem] = []
+    for i, (pub, title, summary, link) in enumerate(raw):
+        if labels[i] != i:
+            continue  # near-duplicate of an earlier item
+        text = f"{title}. {summary}"
+        sent = analyzer.polarity_scores(text)["compound"]  # the overall sentiment score between -1 and 1
+        items.append(NewsItem(pub, title, summary, link, sent, curs[i], int(sizes[i]), dup_links.get(i, [])))
     if not items:
-        return pd.DataFrame(columns=["published","title","summary","link","sentiment","currencies"])
+        return pd.DataFrame(columns=["published","title","summary","link","sentiment","currencies","cluster_size","duplicate_links"])
     df = pd.DataFrame([i.__dict__ for i in items]).sort_values("published", ascending=False)
     return df
 
 def aggregate_daily_sentiment(df: pd.DataFrame) -> pd.DataFrame:
     """
     Expand rows by currency and compute mean sentiment per currency per day.
-    Output columns: date, currency, mean_sentiment, n
+    Output columns: date, currency, mean_sentiment, n, n_items
+
+    `n` counts distinct stories (one per near-duplicate cluster); `n_items`
+    counts the syndicated copies behind them (sum of `cluster_size`).
     """
+    cols = ["date","currency","mean_sentiment","n","n_items"]
     if df.empty:
-        return pd.DataFrame(columns=["date","currency","mean_sentiment","n"])
+        return pd.DataFrame(columns=cols)
+    has_sizes = "cluster_size" in df.columns
     rows = []
     for _, r in df.iterrows():
+        size = int(r["cluster_size"]) if has_sizes else 1
         for c in (r["currencies"] or []):
-            rows.append({"date": r["published"].date(), "currency": c, "sentiment": r["sentiment"]})
+            rows.append({"date": r["published"].date(), "currency": c, "sentiment": r["sentiment"], "size": size})
     if not rows:
-        return pd.DataFrame(columns=["date","currency","mean_sentiment","n"])
+        return pd.DataFrame(columns=cols)
     dd = pd.DataFrame(rows)
-    out = dd.groupby(["date","currency"])["sentiment"].agg(["mean","count"]).reset_index()
-    out = out.rename(columns={"mean": "mean_sentiment", "count": "n"})
-    return out
\ No newline at end of file
+    out = dd.groupby(["date","currency"]).agg(
+        mean_sentiment=("sentiment", "mean"), n=("sentiment", "count"), n_items=("size", "sum")
+    ).reset_index()
+    return out
@@ -0,0 +1,222 @@
+from __future__ import annotations
+import datetime as dt
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+import pandas as pd
+from .config import settings
+from .dedup import cluster_near_duplicates
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    link_hash    TEXT PRIMARY KEY,
+    published    TEXT NOT NULL,
+    pub_date     TEXT NOT NULL,
+    title        TEXT,
+    summary      TEXT,
+    link         TEXT,
+    sentiment    REAL,
+    cluster_size INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS items_pub_date ON items (pub_date);
+-- every link seen, including syndicated copies folded into an item's cluster
+CREATE TABLE IF NOT EXISTS links (
+    link_hash TEXT PRIMARY KEY,
+    item_hash TEXT NOT NULL
+) WITHOUT ROWID;
+-- one row per (item, mentioned currency); the primary key doubles as the
+-- (currency, date) range index used by daily_sentiment
+CREATE TABLE IF NOT EXISTS item_currencies (
+    currency     TEXT NOT NULL,
+    pub_date     TEXT NOT NULL,
+    link_hash    TEXT NOT NULL,
+    sentiment    REAL,
+    cluster_size INTEGER NOT NULL DEFAULT 1,
+    PRIMARY KEY (currency, pub_date, link_hash)
+) WITHOUT ROWID;
+"""
+
+def link_hash(link: str, title: str = "") -> str:
+    """Stable key of a news item: hash of its link (title if there is no link)."""
+    key = (link or "").strip() or f"title:{title.strip()}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+def _as_date_str(d) -> str | None:
+    if d is None:
+        return None
+    return pd.Timestamp(d).date().isoformat()
+
+class NewsArchive:
+    """Append-only SQLite archive of scored news items.
+
+    Items are keyed by `link_hash`, so appending the same fetch twice is a
+    no-op, and indexed by published date and currency so daily sentiment
+    for any date range is a single index range scan.
+    """
+
+    def __init__(self, path: str | Path | None = None, read_only: bool = False):
+        self.path = str(path or settings.news_archive_path)
+        self._lock = threading.Lock()
+        if read_only:
+            # for readers that share the file with a writer (e.g. the compute service)
+            uri = Path(self.path).resolve().as_uri() + "?mode=ro"
+            self._conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            return
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        if self.path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> NewsArchive:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+    def version(self) -> int:
+        """Changes whenever items are added (highest item rowid); 0 when empty."""
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM items").fetchone()[0]
+
+    def _known(self, hashes: list[str]) -> set[str]:
+        found: set[str] = set()
+        for i in range(0, len(hashes), 500):  # stay below SQLite's variable limit
+            chunk = hashes[i:i + 500]
+            q = f"SELECT link_hash FROM links WHERE link_hash IN ({','.join('?' * len(chunk))})"
+            found.update(r[0] for r in self._conn.execute(q, chunk))
+        return found
+
+    def known_hashes(self, hashes: list[str]) -> set[str]:
+        """Subset of `hashes` already seen (as an item or one of its duplicates)."""
+        with self._lock:
+            return self._known(hashes)
+
+    def _match_recent(self, titles: list[str], since: str, threshold: float) -> list[str | None]:
+        """Hash of the archived item (published on/after `since`) each title duplicates, or None."""
+        recent = self._conn.execute(
+            "SELECT link_hash, title FROM items WHERE pub_date >= ? ORDER BY published", (since,)
+        ).fetchall()
+        if not recent:
+            return [None] * len(titles)
+        # archived titles come first, so any cluster holding one is labelled by it
+        labels = cluster_near_duplicates([t or "" for _, t in recent] + titles, threshold=threshold)
+        n = len(recent)
+        return [recent[lab][0] if lab < n else None for lab in labels[n:]]
+
+    def append(self, df: pd.DataFrame, dedup_threshold: float | None = 0.6, dedup_days: int = 7) -> int:
+        """Insert items from a `news.fetch_feeds` frame; returns the number of new items.
+
+        Links listed in an optional `duplicate_links` column are recorded as
+        seen so later fetches skip those syndicated copies too. Rows already
+        in the archive are ignored.
+
+        Unless `dedup_threshold` is None, rows whose title near-duplicates an
+        archived item published up to `dedup_days` earlier are folded into
+        that item (their links are recorded and its `cluster_size` grows)
+        instead of being added as new stories.
+        """
+        if df is None or df.empty:
+            return 0
+        rows = []
+        for r in df.itertuples(index=False):
+            pub = pd.Timestamp(r.published)
+            pub = pub.tz_localize("UTC") if pub.tzinfo is None else pub.tz_convert("UTC")
+            dups = [d for d in (getattr(r, "duplicate_links", None) or []) if d]
+            rows.append((r, pub, link_hash(r.link, r.title), dups))
+        with self._lock, self._conn:
+            known = self._known([h for _, _, h, _ in rows])
+            rows = [row for row in rows if row[2] not in known]
+            if not rows:
+                return 0
+            if dedup_threshold is not None:
+                since = (min(pub for _, pub, _, _ in rows) - pd.Timedelta(days=dedup_days)).date().isoformat()
+                matches = self._match_recent([r.title or "" for r, _, _, _ in rows], since, dedup_threshold)
+            else:
+                matches = [None] * len(rows)
+
+            items, curs, links, folds = [], [], [], []
+            for (r, pub, h, dups), target in zip(rows, matches):
+                size = int(getattr(r, "cluster_size", 1) or 1)
+                if target is not None:
+                    links.extend((x, target) for x in [h, *map(link_hash, dups)])
+                    folds.append((size, target))
+                    continue
+                day = pub.date().isoformat()
+                items.append((h, pub.isoformat(), day, r.title, r.summary, r.link, float(r.sentiment), size))
+                links.append((h, h))
+                links.extend((link_hash(d), h) for d in dups)
+                for c in (r.currencies or []):
+                    curs.append((c, day, h, float(r.sentiment), size))
+            before = self._conn.total_changes
+            self._conn.executemany("INSERT OR IGNORE INTO items VALUES (?,?,?,?,?,?,?,?)", items)
+            added = self._conn.total_changes - before
+            self._conn.executemany("INSERT OR IGNORE INTO item_currencies VALUES (?,?,?,?,?)", curs)
+            self._conn.executemany("INSERT OR IGNORE INTO links VALUES (?,?)", links)
+            self._conn.executemany("UPDATE items SET cluster_size = cluster_size + ? WHERE link_hash = ?", folds)
+            self._conn.executemany("UPDATE item_currencies SET cluster_size = cluster_size + ? WHERE link_hash = ?", folds)
+        return added
+
+    def daily_sentiment(
+        self,
+        start: dt.date | str | pd.Timestamp | None = None,
+        end: dt.date | str | pd.Timestamp | None = None,
+        currencies: list[str] | None = None,
+    ) -> pd.DataFrame:
+        """Mean sentiment per currency per day for [start, end] (inclusive).
+
+        Same columns as `news.aggregate_daily_sentiment`:
+        date, currency, mean_sentiment, n, n_items
+        """
+        where, params = [], []
+        if currencies:
+            where.append(f"currency IN ({','.join('?' * len(currencies))})")
+            params.extend(currencies)
+        if start is not None:
+            where.append("pub_date >= ?")
+            params.append(_as_date_str(start))
+        if end is not None:
+            where.append("pub_date <= ?")
+            params.append(_as_date_str(end))
+        q = (
+            "SELECT pub_date AS date, currency, AVG(sentiment) AS mean_sentiment,"
+            " COUNT(*) AS n, SUM(cluster_size) AS n_items FROM item_currencies"
+            + (f" WHERE {' AND '.join(where)}" if where else "")
+            + " GROUP BY currency, pub_date ORDER BY pub_date, currency"
+        )
+        with self._lock:
+            out = pd.read_sql_query(q, self._conn, params=params)
+        out["date"] = pd.to_datetime(out["date"]).dt.date
+        return out
+
+    def items(
+        self,
+        start: dt.date | str | pd.Timestamp | None = None,
+        end: dt.date | str | pd.Timestamp | None = None,
+    ) -> pd.DataFrame:
+        """Archived items published in [start, end], newest first."""
+        where, params = [], []
+        if start is not None:
+            where.append("pub_date >= ?")
+            params.append(_as_date_str(start))
+        if end is not None:
+            where.append("pub_date <= ?")
+            params.append(_as_date_str(end))
+        q = (
+            "SELECT published, title, summary, link, sentiment, cluster_size FROM items"
+            + (f" WHERE {' AND '.join(where)}" if where else "")
+            + " ORDER BY published DESC"
+        )
+        with self._lock:
+            out = pd.read_sql_query(q, self._conn, params=params)
+        out["published"] = pd.to_datetime(out["published"], utc=True)
+        return out
@@ -0,0 +1,193 @@
+"""Headless report builder.
+
+Renders the dashboard figures (KPI table, time series, % change, heatmap and
+one anomaly chart per currency) for every selected pair without Streamlit and
+writes them as plotly JSON bundles plus a single static HTML page.
+
+Usage:
+    python -m src.report --base EUR --targets USD,GBP,PLN --out reports/
+"""
+from __future__ import annotations
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+import pandas as pd
+from plotly.offline import get_plotlyjs
+from . import anomaly, data_sources, features as feat, transform, viz
+from .config import settings
+from .feature_store import FeatureStore
+from .news_archive import NewsArchive
+
+@dataclass
+class ReportInputs:
+    """Everything the figures need, computed once and shared with the workers."""
+    base: str
+    rates: pd.DataFrame
+    returns: pd.DataFrame
+    metrics: dict[str, dict[str, float]]
+    z_flags: pd.DataFrame
+    if_flags: pd.DataFrame
+    features: FeatureStore
+    z_window: int = 30
+    z_thresh: float = 2.5
+
+def prepare_inputs(
+    rates: pd.DataFrame,
+    base: str,
+    z_window: int = 30,
+    z_thresh: float = 2.5,
+    vol_window: int = 30,
+    contamination: float = 0.01,
+    sentiment_daily: pd.DataFrame | None = None,
+    archive: NewsArchive | None = None,
+) -> ReportInputs:
+    """Run the (expensive) detectors once, mirroring the dashboard defaults."""
+    feats = feat.build_feature_store(rates, sentiment_daily, vol_window=vol_window, archive=archive)
+    return ReportInputs(
+        base=base,
+        rates=rates,
+        returns=transform.pct_change(rates),
+        metrics=transform.compute_kpis(rates),
+        z_flags=anomaly.rolling_zscore_anomalies(rates, window=z_window, z_thresh=z_thresh),
+        if_flags=anomaly.isolation_forest_per_currency(feats, contamination=contamination),
+        features=feats,
+        z_window=z_window,
+        z_thresh=z_thresh,
+    )
+
+def figure_names(inputs: ReportInputs) -> list[str]:
+    """Names of all figures in the report, in display order."""
+    return ["kpis", "timeseries", "returns", "heatmap"] + [f"anomalies_{c}" for c in inputs.rates.columns]
+
+def build_figure(inputs: ReportInputs, name: str):
+    """Build a single figure by name (see `figure_names`)."""
+    if name == "kpis":
+        return viz.plot_kpi_table(inputs.metrics, inputs.base)
+    if name == "timeseries":
+        return viz.plot_timeseries(inputs.rates, inputs.base)
+    if name == "returns":
+        return viz.plot_returns_bar(inputs.returns.tail(30), inputs.base)
+    if name == "heatmap":
+        return viz.plot_heatmap(inputs.returns, inputs.base)
+    if name.startswith("anomalies_"):
+        cur = name[len("anomalies_"):]
+        s = inputs.rates[cur].dropna()
+        zf = inputs.z_flags[cur].reindex(s.index, fill_value=False) if not inputs.z_flags.empty else pd.Series(False, index=s.index)
+        iff = inputs.if_flags[cur].reindex(s.index, fill_value=False) if not inputs.if_flags.empty else pd.Series(False, index=s.index)
+        return viz.plot_anomalies(
+            s, zf, iff, inputs.features.get(cur), cur, inputs.base,
+            z_window=inputs.z_window, z_thresh=inputs.z_thresh,
+        )
+    raise ValueError(f"Unknown figure: {name}")
+
+# Per-process copy of the shared inputs, set once by the pool initializer so
+# each task only ships a figure name instead of re-pickling the data.
+_INPUTS: ReportInputs | None = None
+
+def _init_worker(inputs: ReportInputs) -> None:
+    global _INPUTS
+    _INPUTS = inputs
+
+def _render(name: str) -> tuple[str, str, float]:
+    t0 = time.perf_counter()
+    payload = build_figure(_INPUTS, name).to_json()
+    return name, payload, time.perf_counter() - t0
+
+_HTML_TEMPLATE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title>
+<script src="plotly.min.js"></script></head>
+<body style="font-family:sans-serif;max-width:1200px;margin:auto">
+<h1>{title}</h1>
+{divs}
+<script>
+{scripts}
+</script>
+</body></html>
+"""
+
+def _write_html(path: Path, title: str, payloads: dict[str, str]) -> None:
+    # local copy of plotly.js so the report renders offline
+    (path.parent / "plotly.min.js").write_text(get_plotlyjs(), encoding="utf-8")
+    divs = "\n".join(f'<div id="{n}"></div>' for n in payloads)
+    scripts = "\n".join(
+        f'(function(f){{Plotly.newPlot("{n}", f.data, f.layout);}})({p});' for n, p in payloads.items()
+    )
+    path.write_text(_HTML_TEMPLATE.format(title=title, divs=divs, scripts=scripts), encoding="utf-8")
+
+def build_report(
+    inputs: ReportInputs,
+    out_dir: str | Path,
+    max_workers: int | None = None,
+) -> pd.DataFrame:
+    """Render every figure across a process pool and write the bundle to `out_dir`.
+
+    Writes one `<figure>.json` per figure, `report.html` (with a local
+    `plotly.min.js`) and `timings.json`.
+    Returns a DataFrame of per-figure timings (columns: figure, render_s, bytes).
+    `max_workers=1` renders in-process (no pool).
+    """
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    names = figure_names(inputs)
+
+    if max_workers == 1:
+        _init_worker(inputs)
+        results = [_render(n) for n in names]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(inputs,)) as pool:
+            results = list(pool.map(_render, names))
+
+    payloads: dict[str, str] = {}
+    rows = []
+    for name, payload, secs in results:
+        (out / f"{name}.json").write_text(payload, encoding="utf-8")
+        payloads[name] = payload
+        rows.append({"figure": name, "render_s": secs, "bytes": len(payload)})
+    _write_html(out / "report.html", f"Currency report (base: {inputs.base})", payloads)
+
+    timings = pd.DataFrame(rows, columns=["figure", "render_s", "bytes"])
+    (out / "timings.json").write_text(timings.to_json(orient="records", indent=2), encoding="utf-8")
+    return timings
+
+def main(argv: list[str] | None = None) -> None:
+    p = argparse.ArgumentParser(description="Render static anomaly reports for all selected currency pairs.")
+    p.add_argument("--base", default="EUR")
+    p.add_argument("--targets", default="", help="Comma-separated currencies (default: all)")
+    p.add_argument("--days", type=int, default=365)
+    p.add_argument("--offline", action="store_true", help="Use the offline snapshot")
+    p.add_argument("--out", default="reports")
+    p.add_argument("--workers", type=int, default=None)
+    p.add_argument("--z-window", type=int, default=30)
+    p.add_argument("--z-thresh", type=float, default=2.5)
+    p.add_argument("--vol-window", type=int, default=30)
+    p.add_argument("--contamination", type=float, default=0.01)
+    p.add_argument("--news-archive", default=settings.news_archive_path, help="News archive for the sentiment feature (skipped if missing)")
+    args = p.parse_args(argv)
+
+    base = args.base.upper()
+    rates = data_sources.get_rates(base, args.days, offline=args.offline)
+    targets = [t.strip().upper() for t in args.targets.split(",") if t.strip()]
+    if targets:
+        rates = rates[[c for c in targets if c in rates.columns]]
+    else:
+        rates = rates.drop(columns=[base], errors="ignore")
+    if rates.empty:
+        raise SystemExit("No data returned. Check base currency or offline snapshot.")
+
+    archive = NewsArchive(args.news_archive) if Path(args.news_archive).exists() else None
+    t0 = time.perf_counter()
+    inputs = prepare_inputs(
+        rates, base, z_window=args.z_window, z_thresh=args.z_thresh,
+        vol_window=args.vol_window, contamination=args.contamination, archive=archive,
+    )
+    t_prep = time.perf_counter() - t0
+    timings = build_report(inputs, args.out, max_workers=args.workers)
+    t_total = time.perf_counter() - t0
+
+    print(timings.to_string(index=False, formatters={"render_s": "{:.3f}".format}))
+    print(f"\nprecompute: {t_prep:.2f}s  total: {t_total:.2f}s  figures: {len(timings)}  -> {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+"""Local compute service shared by dashboard sessions.
+
+Wraps `data_sources.get_rates`, `transform.compute_kpis` and the detectors in
+`anomaly` behind a small HTTP API so every Streamlit session (and process)
+reuses one computation. Identical concurrent requests are coalesced into a
+single computation and results are kept in a shared LRU cache.
+
+Endpoints (GET, common params: base, days, offline, targets=USD,PLN):
+    /rates                              -> parquet frame
+    /kpis                               -> JSON
+    /zscore   (+ window, thresh)        -> parquet boolean frame
+    /iforest  (+ vol_window, contamination) -> parquet boolean frame
+    /health                             -> JSON cache stats and news archive
+
+Usage:
+    python -m src.service --port 8765 --news-archive data/news.sqlite
+    COMPUTE_SERVICE_URL=http://127.0.0.1:8765 streamlit run main.py
+"""
+from __future__ import annotations
+import argparse
+import io
+import json
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable
+from urllib.parse import parse_qs, urlparse
+import pandas as pd
+import requests
+from . import anomaly, data_sources, features as feat, transform
+from .config import settings
+from .news_archive import NewsArchive
+
+PARQUET = "application/vnd.apache.parquet"
+JSON = "application/json"
+ENDPOINTS = ("/rates", "/kpis", "/zscore", "/iforest", "/health")
+
+def to_parquet_bytes(df: pd.DataFrame) -> bytes:
+    buf = io.BytesIO()
+    df.to_parquet(buf)
+    return buf.getvalue()
+
+def from_parquet_bytes(data: bytes) -> pd.DataFrame:
+    return pd.read_parquet(io.BytesIO(data))
+
+class _Flight:
+    __slots__ = ("done", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.error: BaseException | None = None
+
+class ResultCache:
+    """Thread-safe LRU + TTL cache that coalesces concurrent misses.
+
+    The first caller of a missing key computes it; callers arriving while
+    that computation runs wait for its result (or error) instead of
+    recomputing.
+    """
+
+    def __init__(self, maxsize: int = 128, ttl_s: float | None = None):
+        self.maxsize = maxsize
+        self.ttl_s = ttl_s
+        self._data: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[Any, _Flight] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0}
+
+    def _lookup(self, key):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if self.ttl_s is not None and time.monotonic() - entry[0] > self.ttl_s:
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return entry
+
+    def get_or_compute(self, key, fn: Callable[[], Any]) -> tuple[Any, str]:
+        """Return (value, status) with status one of 'hit', 'miss', 'coalesced'."""
+        while True:
+            with self._lock:
+                entry = self._lookup(key)
+                if entry is not None:
+                    self.stats["hits"] += 1
+                    return entry[1], "hit"
+                flight = self._inflight.get(key)
+                if flight is None:
+                    flight = self._inflight[key] = _Flight()
+                    self.stats["misses"] += 1
+                    break
+                self.stats["coalesced"] += 1
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            with self._lock:
+                entry = self._lookup(key)
+            if entry is not None:
+                return entry[1], "coalesced"
+            # evicted before we could read it: retry as a normal request
+
+        try:
+            value = fn()
+        except BaseException as e:
+            flight.error = e
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+            raise
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+            self._inflight.pop(key, None)
+        flight.done.set()
+        return value, "miss"
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+class ComputeService:
+    """The cached computations behind the HTTP endpoints.
+
+    `archive_path` is resolved against the working directory at start-up
+    and opened read-only once it exists; `/iforest` results are keyed by the
+    archive's version so newly archived news invalidates them.
+    """
+
+    def __init__(
+        self,
+        cache_size: int = 128,
+        ttl_s: float | None = settings.cache_ttl_min * 60,
+        archive_path: str | None = settings.news_archive_path,
+    ):
+        self.cache = ResultCache(cache_size, ttl_s)
+        self.archive_path = str(Path(archive_path).resolve()) if archive_path else None
+        self._news: NewsArchive | None = None
+        self._news_lock = threading.Lock()
+
+    def rates(self, base: str, days: int, offline: bool, targets: tuple[str, ...]) -> pd.DataFrame:
+        def compute():
+            df = data_sources.get_rates(base, days, offline=offline)
+            if targets:
+                df = df[[c for c in targets if c in df.columns]]
+            return df
+        return self.cache.get_or_compute(("rates", base, days, offline, targets), compute)[0]
+
+    def archive(self) -> NewsArchive | None:
+        """The shared read-only news archive, or None while the file doesn't exist."""
+        if self._news is None and self.archive_path and Path(self.archive_path).exists():
+            with self._news_lock:
+                if self._news is None:
+                    self._news = NewsArchive(self.archive_path, read_only=True)
+        return self._news
+
+    def close(self) -> None:
+        if self._news is not None:
+            self._news.close()
+            self._news = None
+
+    def handle(self, path: str, query: dict[str, list[str]]) -> tuple[bytes, str, str]:
+        """Compute (or fetch from cache) one endpoint; returns (body, content type, cache status)."""
+        q = {k: v[-1] for k, v in query.items()}
+        base = q.get("base", settings.base_currency).upper()
+        days = int(q.get("days", 365))
+        offline = q.get("offline", "0").lower() in ("1", "true", "yes")
+        targets = tuple(t for t in q.get("targets", "").upper().split(",") if t)
+        common = (base, days, offline, targets)
+
+        if path == "/rates":
+            key = ("/rates",) + common
+            fn = lambda: (to_parquet_bytes(self.rates(*common)), PARQUET)
+        elif path == "/kpis":
+            key = ("/kpis",) + common
+            fn = lambda: (json.dumps(transform.compute_kpis(self.rates(*common))).encode(), JSON)
+        elif path == "/zscore":
+            window = int(q.get("window", 30))
+            thresh = float(q.get("thresh", 2.5))
+            key = ("/zscore",) + common + (window, thresh)
+            fn = lambda: (to_parquet_bytes(
+                anomaly.rolling_zscore_anomalies(self.rates(*common), window=window, z_thresh=thresh)
+            ), PARQUET)
+        elif path == "/iforest":
+            vol_window = int(q.get("vol_window", 30))
+            contamination = float(q.get("contamination", 0.01))
+            archive = self.archive()
+            version = archive.version() if archive is not None else None
+            key = ("/iforest",) + common + (vol_window, contamination, version)
+            def fn():
+                store = feat.build_feature_store(self.rates(*common), None, vol_window=vol_window, archive=archive)
+                flags = anomaly.isolation_forest_per_currency(store, contamination=contamination)
+                return to_parquet_bytes(flags), PARQUET
+        elif path == "/health":
+            info = {"entries": len(self.cache), **self.cache.stats, "news_archive": self.archive_path if self.archive() is not None else None}
+            return json.dumps(info).encode(), JSON, "none"
+        else:
+            raise ValueError(f"unknown endpoint {path}")
+        (body, ctype), status = self.cache.get_or_compute(key, fn)
+        return body, ctype, status
+
+def make_handler(service: ComputeService, verbose: bool = False) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            try:
+                if url.path not in ENDPOINTS:
+                    body, ctype, status, code = json.dumps({"error": f"unknown endpoint {url.path}"}).encode(), JSON, "none", 404
+                else:
+                    body, ctype, status = service.handle(url.path, parse_qs(url.query))
+                    code = 200
+            except Exception as e:
+                code = 400 if isinstance(e, ValueError) else 500
+                body, ctype, status = json.dumps({"error": str(e)}).encode(), JSON, "none"
+            self.send_response(code)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("X-Cache", status)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            if verbose:
+                super().log_message(format, *args)
+
+    return Handler
+
+def serve(host: str = "127.0.0.1", port: int = 8765, service: ComputeService | None = None, verbose: bool = False) -> ThreadingHTTPServer:
+    """Create the HTTP server (call `serve_forever()` on the result)."""
+    server = ThreadingHTTPServer((host, port), make_handler(service or ComputeService(), verbose))
+    server.daemon_threads = True
+    return server
+
+class ComputeClient:
+    """Client used by `main.py` when `COMPUTE_SERVICE_URL` is set."""
+
+    def __init__(self, base_url: str, timeout: float = 120):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self._local = threading.local()  # requests.Session is not thread-safe
+
+    def _get(self, path: str, base: str, days: int, offline: bool, targets: list[str] | None, **extra) -> requests.Response:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        params = {"base": base, "days": days, "offline": int(offline), "targets": ",".join(targets or []), **extra}
+        resp = session.get(f"{self.base_url}{path}", params=params, timeout=self.timeout)
+        resp.raise_for_status()
+        return resp
+
+    def rates(self, base: str, days: int, offline: bool = False, targets: list[str] | None = None) -> pd.DataFrame:
+        return from_parquet_bytes(self._get("/rates", base, days, offline, targets).content)
+
+    def kpis(self, base: str, days: int, offline: bool = False, targets: list[str] | None = None) -> dict[str, dict[str, float]]:
+        return self._get("/kpis", base, days, offline, targets).json()
+
+    def zscore(self, base: str, days: int, offline: bool = False, targets: list[str] | None = None,
+               window: int = 30, thresh: float = 2.5) -> pd.DataFrame:
+        resp = self._get("/zscore", base, days, offline, targets, window=window, thresh=thresh)
+        return from_parquet_bytes(resp.content)
+
+    def iforest(self, base: str, days: int, offline: bool = False, targets: list[str] | None = None,
+                vol_window: int = 30, contamination: float = 0.01) -> pd.DataFrame:
+        resp = self._get("/iforest", base, days, offline, targets, vol_window=vol_window, contamination=contamination)
+        return from_parquet_bytes(resp.content)
+
+    def health(self) -> dict:
+        resp = requests.get(f"{self.base_url}/health", timeout=self.timeout)
+        resp.raise_for_status()
+        return resp.json()
+
+def main(argv: list[str] | None = None) -> None:
+    p = argparse.ArgumentParser(description="Shared compute service for the currency dashboard.")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--cache-size", type=int, default=128)
+    p.add_argument("--news-archive", default=settings.news_archive_path, help="News archive for the IsolationForest sentiment feature")
+    p.add_argument("--verbose", action="store_true")
+    args = p.parse_args(argv)
+    service = ComputeService(cache_size=args.cache_size, archive_path=args.news_archive)
+    if service.archive() is None:
+        print(f"Warning: no news archive at {service.archive_path}; /iforest runs without the sentiment feature")
+    server = serve(args.host, args.port, service, verbose=args.verbose)
+    print(f"Serving on http://{args.host}:{server.server_port} (news archive: {service.archive_path})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,335 @@
+"""Live tick ingestion with bounded-memory rolling detectors.
+
+A `TickSource` yields `Tick`s; `TickEngine` keeps a fixed-size ring buffer
+per currency and updates returns, rolling volatility and z-score flags on
+every tick with O(1) work, using the same definitions as the daily
+`anomaly.rolling_zscore_anomalies` (past-only mean/std) and
+`features.rolling_volatility`.
+
+Tick lines are `timestamp,currency,price` where the timestamp is epoch
+seconds or ISO 8601, e.g. `1718000000.25,USD,1.0712`. Ticks whose price is
+not a finite positive number are dropped.
+
+Usage:
+    engine = TickEngine(capacity=10_000, window=30)
+    engine.start(open_tick_source("ticks.csv", speed=10.0))
+    engine.snapshot()          # poll from the dashboard
+"""
+from __future__ import annotations
+import datetime as dt
+import math
+import socket
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Iterable, Iterator, NamedTuple, TextIO
+import numpy as np
+import pandas as pd
+
+class Tick(NamedTuple):
+    ts: float  # epoch seconds
+    currency: str
+    price: float
+
+def parse_tick(line: str) -> Tick | None:
+    """Parse a `timestamp,currency,price` line; None for blank/header lines or bad prices."""
+    parts = line.strip().split(",")
+    if len(parts) != 3:
+        return None
+    ts, cur, price = parts
+    try:
+        p = float(price)
+    except ValueError:
+        return None
+    if not (math.isfinite(p) and p > 0):
+        return None
+    try:
+        t = float(ts)
+    except ValueError:
+        try:
+            d = dt.datetime.fromisoformat(ts)
+        except ValueError:
+            return None
+        if d.tzinfo is None:
+            d = d.replace(tzinfo=dt.timezone.utc)
+        t = d.timestamp()
+    return Tick(t, cur.strip().upper(), p)
+
+class TickSource(ABC):
+    """Pluggable source of ticks; subclasses implement `_lines`.
+
+    `speed` replays ticks relative to their timestamps (1.0 = real time,
+    10.0 = ten times faster); 0 replays as fast as possible.
+    """
+
+    def __init__(self, speed: float = 0.0):
+        self.speed = speed
+        self._closed = threading.Event()
+
+    @abstractmethod
+    def _lines(self) -> Iterable[str]:
+        ...
+
+    def close(self) -> None:
+        self._closed.set()
+
+    def __iter__(self) -> Iterator[Tick]:
+        t0_tick = t0_wall = None
+        for line in self._lines():
+            if self._closed.is_set():
+                return
+            tick = parse_tick(line)
+            if tick is None:
+                continue
+            if self.speed > 0:
+                if t0_tick is None:
+                    t0_tick, t0_wall = tick.ts, time.monotonic()
+                delay = (tick.ts - t0_tick) / self.speed - (time.monotonic() - t0_wall)
+                if delay > 0:
+                    # wake up early if the source is closed while waiting
+                    if self._closed.wait(delay):
+                        return
+            yield tick
+
+class FileReplaySource(TickSource):
+    """Replay ticks from a local text file."""
+
+    def __init__(self, path: str, speed: float = 0.0):
+        super().__init__(speed)
+        self.path = path
+
+    def _lines(self) -> Iterable[str]:
+        with open(self.path, "r", encoding="utf-8") as f:
+            yield from f
+
+class SocketReplaySource(TickSource):
+    """Read newline-delimited ticks from a TCP socket."""
+
+    def __init__(self, host: str, port: int, speed: float = 0.0, timeout: float = 10.0):
+        super().__init__(speed)
+        self.host, self.port, self.timeout = host, port, timeout
+        self._sock: socket.socket | None = None
+
+    def close(self) -> None:
+        super().close()
+        sock = self._sock
+        if sock is not None:
+            # wakes a reader blocked in recv() on a quiet connection
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+
+    def _lines(self) -> Iterable[str]:
+        with socket.create_connection((self.host, self.port), timeout=self.timeout) as sock:
+            self._sock = sock
+            if self._closed.is_set():  # closed while connecting
+                return
+            sock.settimeout(None)
+            f: TextIO = sock.makefile("r", encoding="utf-8")
+            try:
+                yield from f
+            except (OSError, ValueError):
+                if not self._closed.is_set():
+                    raise
+
+def open_tick_source(spec: str, speed: float = 0.0) -> TickSource:
+    """`tcp://host:port` for a socket source, anything else is a file path."""
+    if spec.startswith("tcp://"):
+        host, _, port = spec[len("tcp://"):].rpartition(":")
+        return SocketReplaySource(host, int(port), speed=speed)
+    return FileReplaySource(spec, speed=speed)
+
+class RingBuffer:
+    """Fixed-capacity per-currency tick history (oldest entries overwritten)."""
+    __slots__ = ("capacity", "data", "n")
+
+    COLUMNS = ("ts", "price", "ret", "vol", "z")
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.data = np.full((capacity, len(self.COLUMNS)), np.nan)
+        self.n = 0  # total rows ever appended
+
+    def append(self, row: tuple[float, float, float, float, float]) -> None:
+        self.data[self.n % self.capacity] = row
+        self.n += 1
+
+    def __len__(self) -> int:
+        return min(self.n, self.capacity)
+
+    def to_array(self) -> np.ndarray:
+        """Rows in arrival order (oldest first), as a copy."""
+        if self.n <= self.capacity:
+            return self.data[: self.n].copy()
+        i = self.n % self.capacity
+        return np.concatenate((self.data[i:], self.data[:i]))
+
+class _RollingStats:
+    """Rolling mean/std of the last `window` returns, updated in O(1)."""
+    __slots__ = ("window", "buf", "i", "count", "s", "ss", "updates")
+
+    def __init__(self, window: int):
+        self.window = window
+        self.buf = [0.0] * window
+        self.i = 0
+        self.count = 0
+        self.s = 0.0
+        self.ss = 0.0
+        self.updates = 0
+
+    def mean_std(self) -> tuple[float, float]:
+        """Mean and sample std (ddof=1) of a full window, else NaN."""
+        n = self.count
+        if n < self.window or n < 2:
+            return math.nan, math.nan
+        mu = self.s / n
+        var = (self.ss - n * mu * mu) / (n - 1)
+        return mu, math.sqrt(var) if var > 0 else 0.0
+
+    def push(self, x: float) -> None:
+        old = self.buf[self.i]
+        self.buf[self.i] = x
+        self.i = (self.i + 1) % self.window
+        if self.count < self.window:
+            self.count += 1
+            self.s += x
+            self.ss += x * x
+        else:
+            self.s += x - old
+            self.ss += x * x - old * old
+        self.updates += 1
+        if self.updates % (self.window * 64) == 0:  # limit floating-point drift
+            vals = self.buf[: self.count]
+            self.s = math.fsum(vals)
+            self.ss = math.fsum(v * v for v in vals)
+
+class _CurrencyState:
+    __slots__ = ("buffer", "stats", "last_price", "last", "n_flags")
+
+    def __init__(self, capacity: int, window: int):
+        self.buffer = RingBuffer(capacity)
+        self.stats = _RollingStats(window)
+        self.last_price = math.nan
+        self.last = (math.nan,) * 5
+        self.n_flags = 0
+
+class TickEngine:
+    """Ingest ticks and keep rolling returns, volatility and z-score flags per currency.
+
+    Memory is bounded by `capacity` rows per currency. `snapshot()` and
+    `history()` are safe to call from another thread while `start()` ingests.
+    """
+
+    def __init__(self, capacity: int = 10_000, window: int = 30, z_thresh: float = 2.5):
+        self.capacity = capacity
+        self.window = window
+        self.z_thresh = z_thresh
+        self._states: dict[str, _CurrencyState] = {}
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._source: TickSource | None = None
+        self.n_ticks = 0
+        self.error: BaseException | None = None
+
+    def _state(self, cur: str) -> _CurrencyState:
+        st = self._states.get(cur)
+        if st is None:
+            st = self._states[cur] = _CurrencyState(self.capacity, self.window)
+        return st
+
+    def _update(self, ts: float, cur: str, price: float) -> None:
+        if not (math.isfinite(price) and price > 0):
+            return  # one inf/NaN would poison the running sums for good
+        st = self._states.get(cur) or self._state(cur)
+        prev = st.last_price
+        st.last_price = price
+        if prev != prev:  # first tick
+            ret = vol = z = math.nan
+        else:
+            ret = price / prev - 1.0
+            stats = st.stats
+            # z-score against the previous window only (no look-ahead)
+            mu, sd = stats.mean_std()
+            z = (ret - mu) / sd if sd == sd and sd > 0 else math.nan
+            stats.push(ret)
+            vol = stats.mean_std()[1]
+            if abs(z) >= self.z_thresh:
+                st.n_flags += 1
+        row = (ts, price, ret, vol, z)
+        st.last = row
+        st.buffer.append(row)
+        self.n_ticks += 1
+
+    def ingest(self, tick: Tick) -> None:
+        with self._lock:
+            self._update(tick.ts, tick.currency, tick.price)
+
+    def ingest_many(self, ticks: Iterable[Tick], batch: int = 1024) -> int:
+        """Ingest an iterable of ticks, taking the lock once per `batch`."""
+        n = 0
+        it = iter(ticks)
+        update = self._update
+        while True:
+            chunk = [t for _, t in zip(range(batch), it)]
+            if not chunk:
+                return n
+            with self._lock:
+                for ts, cur, price in chunk:
+                    update(ts, cur, price)
+            n += len(chunk)
+
+    def start(self, source: TickSource) -> threading.Thread:
+        """Ingest from `source` in a background thread."""
+        if self.running:
+            raise RuntimeError("engine is already running")
+        self._source = source
+
+        def run():
+            try:
+                # small batches keep paced replays responsive to pollers
+                self.ingest_many(source, batch=1024 if source.speed <= 0 else 1)
+            except BaseException as e:
+                self.error = e
+
+        self._thread = threading.Thread(target=run, name="tick-engine", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        if self._source is not None:
+            self._source.close()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def currencies(self) -> list[str]:
+        with self._lock:
+            return sorted(self._states)
+
+    def snapshot(self) -> pd.DataFrame:
+        """Latest state per currency: ts, price, ret, vol, z, flag, n_ticks, n_flags."""
+        with self._lock:
+            rows = {
+                cur: (*st.last, st.buffer.n, st.n_flags) for cur, st in self._states.items()
+            }
+        df = pd.DataFrame.from_dict(
+            rows, orient="index", columns=["ts", "price", "ret", "vol", "z", "n_ticks", "n_flags"]
+        ).sort_index()
+        df.insert(5, "flag", df["z"].abs() >= self.z_thresh)
+        df["ts"] = pd.to_datetime(df["ts"], unit="s", utc=True)
+        return df
+
+    def history(self, cur: str) -> pd.DataFrame:
+        """Buffered ticks of one currency (at most `capacity`), oldest first, with flags."""
+        with self._lock:
+            st = self._states.get(cur)
+            arr = st.buffer.to_array() if st is not None else np.empty((0, len(RingBuffer.COLUMNS)))
+        df = pd.DataFrame(arr, columns=list(RingBuffer.COLUMNS))
+        df["flag"] = df["z"].abs() >= self.z_thresh
+        df.index = pd.to_datetime(df.pop("ts"), unit="s", utc=True)
+        return df
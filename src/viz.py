@@ -1,8 +1,10 @@
 from __future__ import annotations
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import streamlit as st
+from plotly.subplots import make_subplots
 
 # Professional, muted palette for charts
 COLOR_PALETTE = ["#0b3954", "#087E8B", "#5D6D7E", "#FFA630", "#E07A5F", "#9BB7D4", "#6A8D92"]
@@ -89,3 +91,176 @@ def plot_heatmap(returns: pd.DataFrame, base: str):
     )
     fig.update_layout(template="plotly_white", margin=dict(l=40, r=20, t=40, b=40), font=dict(color="#0b3d4e"))
     return fig
+
+
+def plot_kpi_table(metrics: dict[str, dict[str, float]], base: str):
+    """Static table version of the KPI cards (for headless reports)."""
+    curs = list(metrics.keys())
+    fmt = lambda v, spec: "n/a" if v is None or pd.isna(v) else format(v, spec)
+    fig = go.Figure(
+        go.Table(
+            header=dict(values=["Pair", "Latest", "7d %", "Vol 90d %"], fill_color="#0b3954", font=dict(color="white")),
+            cells=dict(
+                values=[
+                    [f"{c}/{base}" for c in curs],
+                    [fmt(metrics[c].get("latest"), ".4f") for c in curs],
+                    [fmt(metrics[c].get("chg7"), "+.2f") for c in curs],
+                    [fmt(metrics[c].get("vol90"), ".2f") for c in curs],
+                ],
+                fill_color="white",
+            ),
+        )
+    )
+    fig.update_layout(title=f"KPIs vs {base}", template="plotly_white", margin=dict(l=40, r=20, t=40, b=40), font=dict(color="#0b3d4e"))
+    return fig
+
+def plot_anomalies(
+    s: pd.Series,
+    z_flags: pd.Series,
+    if_flags: pd.Series,
+    features: pd.DataFrame | None,
+    cur: str,
+    base: str,
+    z_window: int = 30,
+    z_thresh: float = 2.5,
+):
+    """Rates with IF markers (row 1) and z-score bars with threshold lines (row 2).
+
+    `z_flags` / `if_flags` are boolean series aligned to `s.index`; `features`
+    is the per-currency ['ret','vol','sent'] table used for the IF hover text.
+    """
+    # -- compute z-score series (for hover/annotations) aligned to s.index
+    rets = s.pct_change()
+    mu = rets.rolling(z_window).mean()
+    sd = rets.rolling(z_window).std()
+    z_series = ((rets - mu) / sd).reindex(s.index)
+
+    zf = z_flags.to_numpy(dtype=bool)
+    iff = if_flags.to_numpy(dtype=bool)
+
+    # Build a 2-row subplot: rates (row 1) and z-score bars (row 2) for clarity
+    fig = make_subplots(
+        rows=2,
+        cols=1,
+        shared_xaxes=True,
+        row_heights=[0.72, 0.28],
+        vertical_spacing=0.06,
+        subplot_titles=(f"{cur}/{base}", "Z-score (returns)")
+    )
+
+    # Row 1: rates line
+    fig.add_trace(
+        go.Scatter(
+            x=s.index,
+            y=s.values,
+            mode="lines",
+            name=f"{cur}/{base}",
+            line=dict(width=2, color="#0b3954"),
+            hovertemplate="Date: %{x}<br>Rate: %{y:.4f}<extra></extra>",
+        ),
+        row=1,
+        col=1,
+    )
+
+    # Row 1: IF markers with detailed hover
+    if iff.any():
+        feats_df = (features if features is not None else pd.DataFrame()).reindex(s.index).fillna(0.0)
+        ret_vals = feats_df.get("ret", pd.Series(0.0, index=s.index)).values
+        vol_vals = feats_df.get("vol", pd.Series(0.0, index=s.index)).values
+        sent_vals = feats_df.get("sent", pd.Series(0.0, index=s.index)).values
+        custom_if = np.vstack([ret_vals[iff], vol_vals[iff], sent_vals[iff]]).T
+        fig.add_trace(
+            go.Scatter(
+                x=s.index[iff],
+                y=s.values[iff],
+                mode="markers",
+                name="IF (ret+vol+sent)",
+                marker=dict(size=10, symbol="circle-open", color="#FFA630"),
+                customdata=custom_if,
+                hovertemplate=(
+                    "Date: %{x}<br>Rate: %{y:.4f}<br>IF anomaly: True"
+                    "<br>Ret: %{customdata[0]:.2%}<br>Vol: %{customdata[1]:.2%}<br>Sent: %{customdata[2]:.2f}<extra></extra>"
+                ),
+            ),
+            row=1,
+            col=1,
+        )
+
+    # Row 2: z-score bars (color by sign)
+    z_vals = z_series.fillna(0.0)
+    colors = ["#E07A5F" if v > 0 else "#087E8B" for v in z_vals]
+    fig.add_trace(
+        go.Bar(
+            x=s.index,
+            y=z_vals,
+            marker_color=colors,
+            name="Z-score",
+            hovertemplate="Date: %{x}<br>Z-score: %{y:.2f}<extra></extra>",
+        ),
+        row=2,
+        col=1,
+    )
+
+    # Add threshold lines on z-score subplot
+    fig.add_hline(y=z_thresh, line=dict(color="rgba(224,122,95,0.6)", dash="dash"), row=2, col=1)
+    fig.add_hline(y=-z_thresh, line=dict(color="rgba(8,126,139,0.6)", dash="dash"), row=2, col=1)
+
+    # Annotate top N absolute z anomalies on z subplot for clarity
+    top_n = 3
+    top_z = z_vals[zf].abs().nlargest(top_n)
+    for idx, val in top_z.items():
+        z_val = z_series.loc[idx]
+        sign_color = "#E07A5F" if z_val > 0 else "#087E8B"
+        bg = "rgba(224,122,95,0.12)" if z_val > 0 else "rgba(8,126,139,0.12)"
+        fig.add_annotation(
+            x=idx,
+            y=z_val,
+            xref='x',
+            yref='y2',
+            text=f"Z={z_val:.2f}",
+            showarrow=True,
+            arrowhead=2,
+            ax=0,
+            ay=-20,
+            bgcolor=bg,
+            bordercolor=sign_color,
+            font=dict(color=sign_color),
+        )
+
+    fig.update_layout(
+        title=f"Anomalies for {cur}/{base}",
+        template="plotly_white",
+        hovermode="x unified",
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        margin=dict(l=40, r=20, t=60, b=40)
+    )
+    fig.update_xaxes(showgrid=False)
+    fig.update_yaxes(showgrid=True, row=1, col=1)
+    fig.update_yaxes(title_text="Z-score", row=2, col=1)
+    return fig
+
+def plot_live_ticks(history: pd.DataFrame, cur: str, base: str):
+    """Buffered live ticks of one currency with z-score flags marked."""
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=history.index, y=history["price"], mode="lines", name=f"{cur}/{base}",
+        line=dict(width=1.5, color="#0b3954"),
+        hovertemplate="Time: %{x}<br>Price: %{y:.5f}<extra></extra>",
+    ))
+    flagged = history[history["flag"]]
+    if not flagged.empty:
+        fig.add_trace(go.Scatter(
+            x=flagged.index, y=flagged["price"], mode="markers", name="Z-score flag",
+            marker=dict(size=9, symbol="circle-open", color="#E07A5F"),
+            customdata=flagged["z"],
+            hovertemplate="Time: %{x}<br>Price: %{y:.5f}<br>Z: %{customdata:.2f}<extra></extra>",
+        ))
+    fig.update_layout(
+        title=f"Live ticks {cur}/{base}",
+        template="plotly_white",
+        hovermode="x unified",
+        margin=dict(l=40, r=20, t=40, b=40),
+        font=dict(color="#0b3d4e"),
+    )
+    fig.update_yaxes(tickformat=".5f")
+    return fig
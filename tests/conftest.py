@@ -0,0 +1,9 @@
+import pytest
+from benchmarks import common
+
+@pytest.fixture
+def random_walk_rates():
+    """`benchmarks.common.random_walk_rates` with small defaults for unit tests."""
+    def make(n=200, currencies=("USD", "PLN"), start="2024-01-01", seed=0, sigma=0.005):
+        return common.random_walk_rates(n, currencies, start=start, seed=seed, sigma=sigma)
+    return make
@@ -0,0 +1,63 @@
+from types import SimpleNamespace
+import pandas as pd
+from src import news
+from src.dedup import cluster_near_duplicates, normalize_title
+from src.news import aggregate_daily_sentiment
+
+def test_normalize_title_strips_publisher():
+    assert normalize_title("EUR/USD rises as ECB holds - Reuters") == "eur usd rises as ecb holds"
+
+def test_syndicated_titles_cluster_together():
+    titles = [
+        "EUR/USD rises as ECB holds rates steady - Reuters",
+        "Yen slumps to a fresh 30-year low against the dollar",
+        "EUR/USD rises as ECB holds rates steady | FXStreet",
+        "EUR/USD Rises as ECB Holds Rates Steady - MarketWatch",
+        "Zloty steady ahead of NBP rate decision",
+    ]
+    labels = cluster_near_duplicates(titles)
+    assert list(labels) == [0, 1, 0, 0, 4]
+
+def test_aggregate_counts_stories_and_items():
+    ts = pd.Timestamp("2024-05-01 10:00", tz="UTC")
+    df = pd.DataFrame({
+        "published": [ts, ts],
+        "sentiment": [0.5, -0.1],
+        "currencies": [["USD"], ["USD"]],
+        "cluster_size": [3, 1],
+    })
+    out = aggregate_daily_sentiment(df)
+    assert out.loc[0, "n"] == 2
+    assert out.loc[0, "n_items"] == 4
+
+def test_empty_titles_stay_singletons():
+    labels = cluster_near_duplicates(["", "", "Dollar up", "---", "ECB"])
+    assert list(labels) == [0, 1, 2, 3, 4]
+
+def _entry(title, summary, link):
+    return SimpleNamespace(
+        title=title, summary=summary, link=link,
+        published_parsed=pd.Timestamp.now("UTC").timetuple(),
+    )
+
+def test_currency_filter_applies_to_every_copy(monkeypatch):
+    entries = [
+        _entry("Markets rally as central bank holds - Reuters", "Stocks climb.", "https://a/1"),
+        _entry("Markets rally as central bank holds | CNBC", "The dollar gains.", "https://b/1"),
+    ]
+    monkeypatch.setattr(news.feedparser, "parse", lambda url: SimpleNamespace(entries=entries))
+    df = news.fetch_feeds(["feed"], filter_currency="USD")
+    assert list(df["link"]) == ["https://b/1"]
+    assert list(df["cluster_size"]) == [1]
+
+def test_entry_repeated_across_feeds_counts_once(monkeypatch):
+    feeds = {
+        "a": [_entry("Dollar rallies as Fed holds - Reuters", "", "https://r/1")],
+        "b": [_entry("Dollar rallies as Fed holds - Reuters", "", "https://r/1"),
+              _entry("Dollar rallies as Fed holds | CNBC", "", "https://c/1")],
+    }
+    monkeypatch.setattr(news.feedparser, "parse", lambda url: SimpleNamespace(entries=feeds[url]))
+    df = news.fetch_feeds(["a", "b"])
+    assert list(df["cluster_size"]) == [2]
+    assert list(df["duplicate_links"]) == [["https://c/1"]]
+    assert list(aggregate_daily_sentiment(df)["n_items"]) == [2]
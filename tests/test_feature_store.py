@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+from src import anomaly, features as feat
+
+@pytest.fixture
+def rates(random_walk_rates):
+    rates = random_walk_rates(120, currencies=("USD", "GBP", "PLN"), seed=3)
+    rates.iloc[60:63, 1] = np.nan  # gap -> non-contiguous valid rows for GBP
+    return rates
+
+def test_store_matches_feature_frames(rates):
+    frames = feat.build_currency_features(rates, None, vol_window=10)
+    store = feat.build_feature_store(rates, None, vol_window=10)
+    assert store.values.dtype == np.float32
+    assert store.values.shape == (3, len(rates), 3)
+    for cur, df in frames.items():
+        got = store.get(cur)
+        assert got.index.equals(df.index)
+        assert np.allclose(got.to_numpy(), df.to_numpy(), rtol=1e-6)
+
+def test_views_share_memory_with_store(rates):
+    store = feat.build_feature_store(rates, None, vol_window=10)
+    view = store.view("USD")
+    assert isinstance(view.rows, slice)
+    assert np.shares_memory(view.X, store.values)
+
+def test_isolation_forest_flags_match_dict_input(rates):
+    frames = feat.build_currency_features(rates, None, vol_window=10)
+    store = feat.build_feature_store(rates, None, vol_window=10)
+    expected = anomaly.isolation_forest_per_currency(frames, contamination=0.05)
+    got = anomaly.isolation_forest_per_currency(store, contamination=0.05)
+    assert got.equals(expected)
+    assert got.to_numpy().any()
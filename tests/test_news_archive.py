@@ -0,0 +1,65 @@
+from types import SimpleNamespace
+import numpy as np
+import pandas as pd
+from src import features as feat, news
+from src.news_archive import NewsArchive, link_hash
+
+def _news():
+    return pd.DataFrame({
+        "published": pd.to_datetime(["2024-03-04 09:00", "2024-03-04 15:00", "2024-03-06 08:00"], utc=True),
+        "title": ["Dollar firms", "Zloty slips", "Dollar slides"],
+        "summary": ["", "", ""],
+        "link": ["http://a/1", "http://a/2", "http://a/3"],
+        "sentiment": [0.4, -0.2, -0.6],
+        "currencies": [["USD"], ["PLN", "USD"], ["USD"]],
+        "cluster_size": [3, 1, 2],
+        "duplicate_links": [["http://b/1", "http://c/1"], [], ["http://b/3"]],
+    })
+
+def test_append_is_incremental(tmp_path):
+    with NewsArchive(tmp_path / "news.sqlite") as archive:
+        assert archive.append(_news()) == 3
+        assert archive.append(_news()) == 0
+        assert len(archive) == 3
+        assert archive.known_hashes([link_hash("http://b/1"), link_hash("http://new")]) == {link_hash("http://b/1")}
+
+def test_daily_sentiment_by_range_and_currency(tmp_path):
+    with NewsArchive(tmp_path / "news.sqlite") as archive:
+        archive.append(_news())
+        out = archive.daily_sentiment("2024-03-04", "2024-03-05", currencies=["USD"])
+        assert len(out) == 1
+        row = out.iloc[0]
+        assert row["n"] == 2 and row["n_items"] == 4
+        assert np.isclose(row["mean_sentiment"], 0.1)
+
+def test_features_read_sentiment_from_archive(tmp_path):
+    idx = pd.bdate_range("2024-02-01", periods=30)
+    rates = pd.DataFrame({"USD": np.linspace(1.0, 1.1, 30), "PLN": np.linspace(4.0, 4.2, 30)}, index=idx)
+    with NewsArchive(tmp_path / "news.sqlite") as archive:
+        archive.append(_news())
+        feats = feat.build_currency_features(rates, None, vol_window=5, archive=archive)
+    assert np.isclose(feats["USD"].loc["2024-03-06", "sent"], -0.6)
+    assert np.isclose(feats["PLN"].loc["2024-03-04", "sent"], -0.2)
+    assert np.isclose(feats["PLN"]["sent"].abs().sum(), 0.2)
+
+def test_syndicated_copy_in_later_fetch_folds_into_story(tmp_path, monkeypatch):
+    now = pd.Timestamp.now("UTC")
+    def entry(title, link):
+        return SimpleNamespace(title=title, summary="The dollar gains.", link=link, published_parsed=now.timetuple())
+    fetches = [
+        [entry("Dollar rallies as Fed holds rates - Reuters", "https://r/1"),
+         entry("Dollar rallies as Fed holds rates | CNBC", "https://c/1")],
+        [entry("Dollar Rallies as Fed Holds Rates - Bloomberg", "https://b/1")],
+    ]
+    with NewsArchive(tmp_path / "news.sqlite") as archive:
+        for entries in fetches:
+            monkeypatch.setattr(news.feedparser, "parse", lambda url, e=entries: SimpleNamespace(entries=e))
+            archive.append(news.fetch_feeds(["feed"], archive=archive))
+        assert len(archive) == 1
+        out = archive.daily_sentiment(currencies=["USD"])
+        assert out["n"].tolist() == [1] and out["n_items"].tolist() == [3]
+        assert archive.known_hashes([link_hash("https://b/1")]) == {link_hash("https://b/1")}
+        # re-appending the folded copy must not count it twice
+        monkeypatch.setattr(news.feedparser, "parse", lambda url: SimpleNamespace(entries=fetches[1]))
+        archive.append(news.fetch_feeds(["feed"], archive=None))
+        assert archive.daily_sentiment(currencies=["USD"])["n_items"].tolist() == [3]
@@ -0,0 +1,13 @@
+import json
+from src import report
+
+def test_build_report_writes_bundle(tmp_path, random_walk_rates):
+    inputs = report.prepare_inputs(random_walk_rates(), "EUR")
+    timings = report.build_report(inputs, tmp_path, max_workers=2)
+    assert list(timings["figure"]) == report.figure_names(inputs)
+    assert "anomalies_PLN" in set(timings["figure"])
+    fig = json.loads((tmp_path / "anomalies_USD.json").read_text())
+    assert fig["layout"]["title"]["text"] == "Anomalies for USD/EUR"
+    html = (tmp_path / "report.html").read_text()
+    assert 'src="plotly.min.js"' in html and "cdn.plot.ly" not in html
+    assert (tmp_path / "plotly.min.js").stat().st_size > 0
@@ -0,0 +1,70 @@
+import threading
+import time
+import pandas as pd
+from src import anomaly, transform
+from src.config import settings
+from src.news_archive import NewsArchive
+from src.service import ComputeClient, ComputeService, ResultCache, serve
+
+def test_cache_coalesces_concurrent_misses():
+    cache = ResultCache(maxsize=2)
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.1)
+        return 42
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute("k", slow))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+    assert all(v == 42 for v, _ in results)
+    assert cache.get_or_compute("k", slow) == (42, "hit")
+
+def test_cache_evicts_least_recently_used():
+    cache = ResultCache(maxsize=2)
+    for k in "abc":
+        cache.get_or_compute(k, lambda k=k: k)
+    assert len(cache) == 2
+    assert cache.get_or_compute("a", lambda: "again") == ("again", "miss")
+
+def test_client_roundtrip(tmp_path, monkeypatch, random_walk_rates):
+    snap = tmp_path / "snapshot.parquet"
+    random_walk_rates(300, currencies=("USD", "PLN", "GBP"), start="2023-01-02").assign(EUR=1.0).to_parquet(snap)
+    monkeypatch.setattr(settings, "snapshot_path", str(snap))
+    server = serve(port=0, service=ComputeService(archive_path=None))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        client = ComputeClient(f"http://127.0.0.1:{server.server_port}")
+        args = dict(base="EUR", days=200, offline=True, targets=["USD", "PLN"])
+        rates = client.rates(**args)
+        assert list(rates.columns) == ["USD", "PLN"]
+        assert client.kpis(**args).keys() == transform.compute_kpis(rates).keys()
+        z = client.zscore(**args, window=20, thresh=2.0)
+        assert z.equals(anomaly.rolling_zscore_anomalies(rates, window=20, z_thresh=2.0))
+        assert client.iforest(**args).shape[1] == 2
+        assert client.health()["hits"] >= 1  # /kpis, /zscore and /iforest reuse the cached rates
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_iforest_cache_follows_archive_version(tmp_path, monkeypatch, random_walk_rates):
+    snap = tmp_path / "snapshot.parquet"
+    random_walk_rates(120, currencies=("USD",), start="2024-01-01").assign(EUR=1.0).to_parquet(snap)
+    monkeypatch.setattr(settings, "snapshot_path", str(snap))
+    service = ComputeService(archive_path=str(tmp_path / "news.sqlite"))
+    query = {"base": ["EUR"], "days": ["120"], "offline": ["1"], "targets": ["USD"]}
+    with NewsArchive(service.archive_path) as archive:
+        assert service.handle("/iforest", query)[2] == "miss"
+        assert service.handle("/iforest", query)[2] == "hit"
+        archive.append(pd.DataFrame({
+            "published": [pd.Timestamp("2024-02-01", tz="UTC")], "title": ["Dollar firms"], "summary": [""],
+            "link": ["http://a/1"], "sentiment": [0.5], "currencies": [["USD"]],
+        }))
+        assert service.handle("/iforest", query)[2] == "miss"
+        assert service.archive() is service.archive()  # opened once and reused
+    service.close()
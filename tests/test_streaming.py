@@ -0,0 +1,100 @@
+import socket
+import threading
+import time
+import numpy as np
+import pandas as pd
+from src import anomaly, features
+from src.streaming import FileReplaySource, Tick, TickEngine, open_tick_source, parse_tick
+
+def _prices(n=400):
+    rng = np.random.default_rng(0)
+    p = np.exp(np.cumsum(rng.normal(0, 0.001, n)))
+    p[200:] *= 1.01  # jump -> z-score flag
+    return p
+
+def test_parse_tick_formats():
+    assert parse_tick("1700000000.5,usd,1.07") == Tick(1700000000.5, "USD", 1.07)
+    assert parse_tick("2024-05-01T10:00:00,PLN,4.31").ts == pd.Timestamp("2024-05-01 10:00", tz="UTC").timestamp()
+    assert parse_tick("ts,currency,price") is None
+
+def test_bad_prices_are_rejected():
+    for price in ("inf", "-inf", "nan", "0", "-1.2"):
+        assert parse_tick(f"1700000000,USD,{price}") is None
+    p = _prices(100)
+    ticks = [Tick(float(i), "USD", float(x)) for i, x in enumerate(p)]
+    ticks[50:50] = [Tick(50.0, "USD", float("inf")), Tick(50.0, "USD", 0.0), Tick(50.0, "USD", float("nan"))]
+    engine = TickEngine(capacity=1000, window=10)
+    engine.ingest_many(ticks)
+    hist = engine.history("USD")
+    assert engine.n_ticks == len(hist) == 100
+    assert np.isfinite(hist["vol"].iloc[10:]).all()
+
+def test_engine_matches_daily_detectors():
+    p = _prices()
+    engine = TickEngine(capacity=1000, window=30, z_thresh=2.5)
+    engine.ingest_many(Tick(float(i), "USD", float(x)) for i, x in enumerate(p))
+    hist = engine.history("USD")
+    rates = pd.DataFrame({"USD": p})
+    expected_flags = anomaly.rolling_zscore_anomalies(rates, window=30, z_thresh=2.5)["USD"]
+    expected_vol = features.rolling_volatility(rates.pct_change(), 30)["USD"]
+    assert (hist["flag"].to_numpy() == expected_flags.to_numpy()).all()
+    assert hist["flag"].iloc[200]
+    assert np.allclose(hist["vol"].to_numpy(), expected_vol.to_numpy(), equal_nan=True)
+
+def test_ring_buffer_is_bounded():
+    engine = TickEngine(capacity=50, window=10)
+    engine.ingest_many(Tick(float(i), "GBP", 1.0 + i * 1e-4) for i in range(500))
+    hist = engine.history("GBP")
+    assert len(hist) == 50
+    assert hist.index[0] == pd.Timestamp(450, unit="s", tz="UTC")
+    assert engine.snapshot().loc["GBP", "n_ticks"] == 500
+
+def test_file_and_socket_sources(tmp_path):
+    lines = "ts,currency,price\n" + "".join(f"{i},USD,{1 + i / 1000}\n" for i in range(100))
+    path = tmp_path / "ticks.csv"
+    path.write_text(lines)
+    assert isinstance(open_tick_source(str(path)), FileReplaySource)
+    assert len(list(FileReplaySource(str(path)))) == 100
+
+    srv = socket.create_server(("127.0.0.1", 0))
+    port = srv.getsockname()[1]
+
+    def feed():
+        conn, _ = srv.accept()
+        with conn:
+            conn.sendall(lines.encode())
+
+    threading.Thread(target=feed, daemon=True).start()
+    engine = TickEngine(window=10)
+    engine.start(open_tick_source(f"tcp://127.0.0.1:{port}")).join(timeout=5)
+    srv.close()
+    assert engine.error is None
+    assert engine.snapshot().loc["USD", "n_ticks"] == 100
+
+def test_stop_interrupts_idle_socket():
+    srv = socket.create_server(("127.0.0.1", 0))
+    port = srv.getsockname()[1]
+    done = threading.Event()
+
+    def feed():
+        conn, _ = srv.accept()
+        with conn:
+            conn.sendall(b"1,USD,1.07\n")
+            done.wait(10)  # then go quiet without closing
+
+    threading.Thread(target=feed, daemon=True).start()
+    engine = TickEngine(window=10)
+    engine.start(open_tick_source(f"tcp://127.0.0.1:{port}"))
+    for _ in range(100):
+        if engine.n_ticks:
+            break
+        time.sleep(0.01)
+    t0 = time.monotonic()
+    engine.stop(timeout=5)
+    try:
+        assert not engine.running
+        assert time.monotonic() - t0 < 1
+        assert engine.error is None
+    finally:
+        done.set()
+        srv.close()